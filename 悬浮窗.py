@@ -7,14 +7,17 @@ from functools import partial
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QMenu, QPushButton, QVBoxLayout,
     QHBoxLayout, QLabel, QScrollArea, QFrame, QSizePolicy, QLineEdit, QGridLayout, QGraphicsOpacityEffect,
-    QDialog, QListWidget, QListWidgetItem, QFormLayout, QSpinBox, QSlider, QCheckBox
+    QDialog, QListWidget, QListWidgetItem, QFormLayout, QSpinBox, QSlider, QCheckBox,
+    QListView, QStyledItemDelegate, QStyle
 )
 from PyQt6.QtWidgets import QFileDialog, QMessageBox, QInputDialog
 from PyQt6.QtCore import Qt, QPoint, QPointF, QEvent, QSize, QTimer, QMimeData, QPropertyAnimation, QEasingCurve, QParallelAnimationGroup, QRect, QSequentialAnimationGroup
 from PyQt6.QtGui import QPainter, QColor, QBrush, QIcon, QPixmap, QDrag, QPen, QLinearGradient, QRadialGradient
-from PyQt6.QtCore import pyqtSignal, QThread
+from PyQt6.QtCore import pyqtSignal, QThread, QObject, QRunnable, QThreadPool
 from PyQt6.QtWidgets import QFileIconProvider
-from PyQt6.QtCore import QFileInfo
+from PyQt6.QtCore import QFileInfo, QBuffer, QByteArray, QIODevice
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, QRectF
+from PyQt6.QtGui import QImage, QImageReader
 import ctypes
 from ctypes import wintypes
 import math
@@ -22,7 +25,21 @@ import urllib.parse
 import hashlib
 import urllib.request
 import ssl
+import asyncio
+import codecs
+from html.parser import HTMLParser
+import threading
+import time
+import bisect
+import itertools
+import atexit
 from PyQt6.QtGui import QFontMetrics, QFont
+# 可选依赖：pypinyin（pip install pypinyin）。安装后搜索支持完整拼音（changjing -> 场景设计），
+# 未安装时只支持拼音首字母（cjsj，按 GB2312 编码区间推算），首次建立搜索索引时会在控制台提示
+try:
+    from pypinyin import lazy_pinyin, Style as PinyinStyle
+except ImportError:
+    lazy_pinyin = None
 
 # ========== FastRun UI 设计系统 ==========
 # 苹果风格配色方案
@@ -154,57 +171,962 @@ def resolve_windows_shortcut(path):
         return None, None
 
 
-def fetch_favicon_bytes(url, timeout=6):
-    """尝试获取 favicon 字节数据：先访问 /favicon.ico，再尝试解析页面寻找 <link rel="icon">。"""
+def favicon_origin(url):
+    """返回 URL 的站点（scheme://host[:port]，小写、省略默认端口），作为 favicon 的共享缓存键。"""
     try:
-        parsed = urllib.parse.urlparse(url)
-        base = f"{parsed.scheme}://{parsed.netloc}"
+        parsed = urllib.parse.urlsplit(url.strip())
+        scheme = parsed.scheme.lower()
+        host = parsed.hostname
+        port = parsed.port
     except Exception:
         return None
+    if scheme not in ('http', 'https') or not host:
+        return None
+    if port and port != (443 if scheme == 'https' else 80):
+        host = f"{host}:{port}"
+    return f"{scheme}://{host}"
 
-    ctx = ssl.create_default_context()
-    # 尝试 root /favicon.ico
-    try:
-        fav_url = urllib.parse.urljoin(base, '/favicon.ico')
-        with urllib.request.urlopen(fav_url, timeout=timeout, context=ctx) as resp:
-            data = resp.read()
-            if data:
-                return data
-    except Exception:
-        pass
 
-    # 尝试解析主页寻找 link rel
-    try:
-        with urllib.request.urlopen(url, timeout=timeout, context=ctx) as resp:
-            html = resp.read().decode('utf-8', errors='ignore')
-    except Exception:
-        html = ''
-
-    # 简单解析 link rel=icon / shortcut icon
-    import re
-    m = re.search(r'<link[^>]+rel=["\']?(?:shortcut icon|icon)["\']?[^>]*>', html, re.IGNORECASE)
-    if m:
-        tag = m.group(0)
-        href_m = re.search(r'href=["\']([^"\']+)["\']', tag)
-        if href_m:
-            href = href_m.group(1)
-            fav_url = urllib.parse.urljoin(base, href)
+def favicon_page_key(url):
+    """页面级图标覆盖的缓存键：站点 + 路径（忽略 query/fragment）；根路径返回 None。"""
+    origin = favicon_origin(url)
+    if not origin:
+        return None
+    path = urllib.parse.urlsplit(url.strip()).path.rstrip('/')
+    return origin + path if path else None
+
+
+class IconLinkParser(HTMLParser):
+    """增量解析 HTML 的 <head>，收集图标候选（icon / shortcut icon / apple-touch-icon / manifest）。
+
+    通过 feed_bytes 逐块喂入数据；遇到 </head> 或 <body> 后 done 置为 True，调用方即可停止下载。
+    """
+
+    ICON_RELS = ('icon', 'apple-touch-icon', 'apple-touch-icon-precomposed', 'manifest')
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+        self.bytes_seen = 0
+        self.done = False
+        self.base_href = None
+        # [{'href', 'rel', 'sizes', 'type'}]，href 为原始值，candidates() 时再解析为绝对地址
+        self._links = []
+
+    def feed_bytes(self, chunk):
+        if self.done:
+            return
+        self.bytes_seen += len(chunk)
+        self.feed(self._decoder.decode(chunk))
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if tag == 'body':
+            self.done = True
+            return
+        attrs = {k.lower(): (v or '') for k, v in attrs}
+        if tag == 'base' and attrs.get('href') and self.base_href is None:
+            self.base_href = attrs['href'].strip()
+        elif tag == 'link' and attrs.get('href'):
+            rels = attrs.get('rel', '').lower().split()
+            rel = next((r for r in self.ICON_RELS if r in rels), None)
+            if rel is not None:
+                self._links.append({
+                    'href': attrs['href'].strip(),
+                    'rel': rel,
+                    'sizes': attrs.get('sizes', '').strip().lower(),
+                    'type': attrs.get('type', '').strip().lower(),
+                })
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if tag == 'head':
+            self.done = True
+
+    def candidates(self, page_url):
+        """返回按文档顺序排列、href 已解析为绝对地址的候选列表。"""
+        base = urllib.parse.urljoin(page_url, self.base_href) if self.base_href else page_url
+        result = []
+        for link in self._links:
+            c = dict(link)
+            c['href'] = urllib.parse.urljoin(base, link['href'])
+            result.append(c)
+        return result
+
+
+# 图标候选的内容类型 / 扩展名 -> 格式名（与 QImageReader 的格式名一致）
+_ICON_FORMATS = {
+    'image/png': 'png', 'image/x-icon': 'ico', 'image/vnd.microsoft.icon': 'ico', 'image/ico': 'ico',
+    'image/svg+xml': 'svg', 'image/gif': 'gif', 'image/jpeg': 'jpg', 'image/webp': 'webp', 'image/bmp': 'bmp',
+    '.png': 'png', '.ico': 'ico', '.svg': 'svg', '.gif': 'gif', '.jpg': 'jpg', '.jpeg': 'jpg',
+    '.webp': 'webp', '.bmp': 'bmp',
+}
+# 解码开销排序：PNG 最省，ICO 次之（多帧），其它光栅格式再次，SVG 需要矢量渲染
+_ICON_FORMAT_COST = {'png': 0, 'ico': 1, 'gif': 2, 'bmp': 2, 'jpg': 2, 'webp': 2, None: 2, 'svg': 3}
+# 未声明 sizes 时的估计像素：apple-touch-icon 通常为 180，/favicon.ico 与普通 icon 按 32 计
+_ICON_DEFAULT_PX = {'apple-touch-icon': 180, 'apple-touch-icon-precomposed': 180}
+_decodable_formats = None
+
+
+def _icon_decodable_formats():
+    global _decodable_formats
+    if _decodable_formats is None:
+        fmts = {bytes(f).decode('ascii', 'ignore').lower() for f in QImageReader.supportedImageFormats()}
+        if 'jpeg' in fmts:
+            fmts.add('jpg')
+        _decodable_formats = fmts
+    return _decodable_formats
+
+
+def icon_candidate_format(c):
+    """候选的图片格式：优先 type 属性，其次 href 扩展名；未知返回 None。"""
+    fmt = _ICON_FORMATS.get(c.get('type') or '')
+    if fmt is None:
+        ext = os.path.splitext(urllib.parse.urlsplit(c['href']).path)[1].lower()
+        fmt = _ICON_FORMATS.get(ext)
+    return fmt
+
+
+def icon_candidate_px(c):
+    """候选声明的最大边长（像素）；sizes="any"（矢量）返回 0，未声明时按 rel 估计。"""
+    best = None
+    for tok in (c.get('sizes') or '').split():
+        if tok == 'any':
+            return 0
+        w, _, h = tok.partition('x')
+        try:
+            px = max(int(w), int(h))
+        except ValueError:
+            continue
+        best = px if best is None else max(best, px)
+    if best is None:
+        best = _ICON_DEFAULT_PX.get(c.get('rel'), 32)
+    return best
+
+
+def rank_icon_candidates(candidates, target_px):
+    """按与目标显示尺寸的匹配程度排序图标候选（不含 manifest），返回新列表。
+
+    优先不小于 target_px 的最小尺寸（缩小而不放大、解码量最少）；都偏小时取最大的。
+    尺寸相同时按解码开销（PNG < ICO < 其它 < SVG）和文档顺序。当前 Qt 不能解码的格式直接排除。
+    """
+    decodable = _icon_decodable_formats()
+    scored = []
+    seen = set()
+    for order, c in enumerate(candidates):
+        if c.get('rel') == 'manifest' or c['href'] in seen:
+            continue
+        seen.add(c['href'])
+        fmt = icon_candidate_format(c)
+        if fmt is not None and fmt not in decodable:
+            continue
+        px = icon_candidate_px(c)
+        if px == 0:
+            # 矢量图任意尺寸都清晰，但渲染较贵：按 2 倍目标尺寸参与排序
+            px = target_px * 2
+        if px >= target_px:
+            key = (0, px - target_px)
+        else:
+            key = (1, target_px - px)
+        scored.append((key, _ICON_FORMAT_COST.get(fmt, 2), order, c))
+    scored.sort(key=lambda s: s[:3])
+    return [s[3] for s in scored]
+
+
+class FaviconResult:
+    """一个页面 URL 的抓取结果：站点级图标 + 可选的页面级 <link rel=icon> 覆盖。
+
+    origin_status / page_status 取值：
+    'fetched' 下载到新图标；'not_modified' 条件请求返回 304；'failed' 网络失败或没有图标；
+    'alias'（仅页面）页面没有独立图标；None 未请求。
+    """
+    __slots__ = ('url', 'origin', 'origin_status', 'origin_data', 'origin_meta',
+                 'page_key', 'page_status', 'page_data', 'page_meta')
+
+    def __init__(self, url):
+        self.url = url
+        self.origin = favicon_origin(url)
+        self.origin_status = None
+        self.origin_data = None
+        self.origin_meta = None
+        self.page_key = favicon_page_key(url)
+        self.page_status = None
+        self.page_data = None
+        self.page_meta = None
+
+    @property
+    def data(self):
+        return self.page_data or self.origin_data
+
+
+class _HttpResponse:
+    """FaviconFetcher 内部使用的极简响应对象。"""
+    __slots__ = ('url', 'status', 'headers', 'body', 'truncated')
+
+    def __init__(self, url, status, headers, body, truncated=False):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+        # 响应体超过 max_body 被截断
+        self.truncated = truncated
+
+
+class FaviconFetcher:
+    """基于 asyncio 的批量 favicon 抓取引擎（仅依赖标准库）。
+
+    - 按 (scheme, host, port) 复用 HTTP/1.1 keep-alive 连接，SSL 上下文只创建一次；
+    - 全局并发上限 + 每主机连接上限；
+    - 同一 URL 的并发请求合并为一次，同一站点的图标只解析一次；
+    - fetch_many 受整体 deadline 约束，到期未完成的 URL 返回 None。
+    """
+
+    USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) FastRun'
+    MAX_REDIRECTS = 4
+    MAX_ICON_BYTES = 1024 * 1024
+    # 扫描页面 <head> 时最多读取的字节数
+    HEAD_SCAN_BYTES = 64 * 1024
+    # 最佳候选下载失败时，最多再尝试的候选数
+    MAX_ICON_ATTEMPTS = 3
+
+    def __init__(self, timeout=6, deadline=20, max_concurrency=8, per_host=2, ssl_context=None,
+                 target_px=64):
+        self.timeout = timeout
+        # 图标的目标显示边长（物理像素），用于在多个候选中挑选尺寸最合适的一个
+        self.target_px = max(1, int(target_px))
+        self.deadline = deadline
+        self.per_host = per_host
+        self._ssl_context = ssl_context or ssl.create_default_context()
+        self._global_sem = asyncio.Semaphore(max_concurrency)
+        self._host_sems = {}
+        # (scheme, host, port) -> [(reader, writer), ...] 空闲连接
+        self._idle = {}
+        # 合并中的请求：url -> Task
+        self._inflight = {}
+
+    # --- 连接池 ---
+    def _host_sem(self, key):
+        sem = self._host_sems.get(key)
+        if sem is None:
+            sem = self._host_sems[key] = asyncio.Semaphore(self.per_host)
+        return sem
+
+    async def _open(self, key):
+        scheme, host, port = key
+        if scheme == 'https':
+            coro = asyncio.open_connection(host, port, ssl=self._ssl_context, server_hostname=host)
+        else:
+            coro = asyncio.open_connection(host, port)
+        return await asyncio.wait_for(coro, self.timeout)
+
+    @staticmethod
+    def _close(conn):
+        try:
+            conn[1].close()
+        except Exception:
+            pass
+
+    async def aclose(self):
+        """关闭所有空闲连接。"""
+        for conns in self._idle.values():
+            for conn in conns:
+                self._close(conn)
+        self._idle.clear()
+
+    # --- HTTP ---
+    @staticmethod
+    async def _iter_body(reader, headers, chunk_size=16 * 1024):
+        """按块读取响应体（chunked / Content-Length / 读到连接关闭）。"""
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            while True:
+                size_line = await reader.readline()
+                size = int(size_line.split(b';', 1)[0].strip() or b'0', 16)
+                if size == 0:
+                    # 跳过 trailer
+                    while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                        pass
+                    return
+                data = await reader.readexactly(size)
+                await reader.readexactly(2)
+                yield data
+        elif 'content-length' in headers:
+            remaining = int(headers['content-length'])
+            while remaining > 0:
+                data = await reader.read(min(chunk_size, remaining))
+                if not data:
+                    raise asyncio.IncompleteReadError(b'', remaining)
+                remaining -= len(data)
+                yield data
+        else:
+            while True:
+                data = await reader.read(chunk_size)
+                if not data:
+                    return
+                yield data
+
+    async def _roundtrip(self, conn, host_header, target, max_body, extra_headers=None, on_chunk=None):
+        reader, writer = conn
+        extra = ''.join(f"{k}: {v}\r\n" for k, v in (extra_headers or {}).items())
+        request = (
+            f"GET {target} HTTP/1.1\r\n"
+            f"Host: {host_header}\r\n"
+            f"User-Agent: {self.USER_AGENT}\r\n"
+            "Accept: */*\r\n"
+            "Accept-Encoding: identity\r\n"
+            f"{extra}"
+            "Connection: keep-alive\r\n\r\n"
+        )
+        writer.write(request.encode('latin-1'))
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError('connection closed')
+        parts = status_line.decode('latin-1').split(None, 2)
+        if len(parts) < 2 or not parts[0].startswith('HTTP/'):
+            raise ConnectionError('bad status line')
+        status = int(parts[1])
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        keep = parts[0] != 'HTTP/1.0' and headers.get('connection', '').lower() != 'close'
+        if 'content-length' not in headers and headers.get('transfer-encoding', '').lower() != 'chunked':
+            # 没有长度信息：读到连接关闭为止
+            keep = False
+        chunks = []
+        total = 0
+        truncated = False
+        if not (status in (204, 304) or 100 <= status < 200):
+            # 只把成功响应的正文交给流式消费者，重定向/错误页照常读取
+            consumer = on_chunk if status == 200 else None
+            body_iter = self._iter_body(reader, headers)
+            complete = True
+            try:
+                async for chunk in body_iter:
+                    total += len(chunk)
+                    if consumer is not None:
+                        if consumer(chunk):
+                            complete = False
+                            break
+                    else:
+                        chunks.append(chunk)
+                    if total > max_body:
+                        truncated = True
+                        complete = False
+                        break
+            finally:
+                await body_iter.aclose()
+            if not complete:
+                # 正文没有读完，连接不能复用
+                keep = False
+        body = b''.join(chunks)
+        return status, headers, body, keep, truncated
+
+    async def _request(self, url, max_body, extra_headers=None, on_chunk=None):
+        parsed = urllib.parse.urlsplit(url)
+        scheme = parsed.scheme.lower()
+        if scheme not in ('http', 'https') or not parsed.hostname:
+            raise ValueError(f'unsupported url: {url}')
+        port = parsed.port or (443 if scheme == 'https' else 80)
+        key = (scheme, parsed.hostname, port)
+        target = parsed.path or '/'
+        if parsed.query:
+            target += '?' + parsed.query
+        host_header = parsed.hostname if parsed.port is None else f"{parsed.hostname}:{parsed.port}"
+
+        delivered = False
+
+        def consume(chunk):
+            nonlocal delivered
+            delivered = True
+            return on_chunk(chunk)
+
+        consumer = consume if on_chunk is not None else None
+        # 先等主机名额再占全局名额：排队等待繁忙主机的请求不占用其他主机可用的全局并发
+        async with self._host_sem(key), self._global_sem:
+            idle = self._idle.setdefault(key, [])
+            conn = idle.pop() if idle else None
+            reused = conn is not None
+            if conn is None:
+                conn = await self._open(key)
+            try:
+                status, headers, body, keep, truncated = await asyncio.wait_for(
+                    self._roundtrip(conn, host_header, target, max_body, extra_headers, consumer), self.timeout)
+            except (TimeoutError, asyncio.TimeoutError):
+                # 超时（在 3.11 中也是 OSError）不重试，否则等待时间翻倍
+                self._close(conn)
+                raise
+            except (ConnectionError, asyncio.IncompleteReadError, OSError):
+                self._close(conn)
+                # 正文已有部分交给流式消费者时不能重发，否则消费者会收到重复的数据
+                if not reused or delivered:
+                    raise
+                # 复用的连接可能已被服务端关闭，换新连接重试一次
+                conn = await self._open(key)
+                try:
+                    status, headers, body, keep, truncated = await asyncio.wait_for(
+                        self._roundtrip(conn, host_header, target, max_body, extra_headers, consumer),
+                        self.timeout)
+                except BaseException:
+                    self._close(conn)
+                    raise
+            except BaseException:
+                self._close(conn)
+                raise
+            if keep:
+                idle.append(conn)
+            else:
+                self._close(conn)
+        return _HttpResponse(url, status, headers, body, truncated)
+
+    async def _get_uncached(self, url, max_body, extra_headers=None, on_chunk=None):
+        """GET 并跟随重定向；on_chunk(bytes) 逐块接收 200 响应的正文，返回 True 时提前结束读取。"""
+        for _ in range(self.MAX_REDIRECTS + 1):
+            resp = await self._request(url, max_body, extra_headers, on_chunk)
+            location = resp.headers.get('location')
+            if resp.status in (301, 302, 303, 307, 308) and location:
+                url = urllib.parse.urljoin(url, location)
+                continue
+            return resp
+        return resp
+
+    async def _shared(self, key, factory):
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _t, k=key: self._inflight.pop(k, None))
+        return await asyncio.shield(task)
+
+    async def get(self, url, max_body):
+        """GET（跟随重定向）；同一 URL 的并发调用共享同一次请求。"""
+        return await self._shared(url, lambda: self._get_uncached(url, max_body))
+
+    # --- favicon ---
+    @staticmethod
+    def _looks_like_image(resp):
+        if resp.status != 200 or not resp.body or resp.truncated:
+            return False
+        ctype = resp.headers.get('content-type', '').lower()
+        if ctype.startswith('text/'):
+            return False
+        # 一些站点对不存在的 /favicon.ico 返回 200 + HTML 错误页
+        if resp.body.lstrip()[:1] == b'<' and not ctype.startswith('image/svg'):
+            return False
+        return True
+
+    async def _get_image(self, url):
+        """下载图标，成功返回响应对象，否则返回 None。"""
+        try:
+            resp = await self.get(url, self.MAX_ICON_BYTES)
+        except Exception:
+            return None
+        return resp if self._looks_like_image(resp) else None
+
+    @staticmethod
+    def _validators(resp, href=None):
+        """从图标响应中提取之后条件请求所需的元数据；href 为页面声明的地址（重定向前）。"""
+        return {
+            'url': resp.url,
+            'href': href if href and href != resp.url else None,
+            'etag': resp.headers.get('etag'),
+            'last_modified': resp.headers.get('last-modified'),
+        }
+
+    async def _revalidate(self, meta):
+        """对已缓存图标发条件 GET。
+
+        返回 ('not_modified', None) / ('modified', resp) / ('gone', None) / ('failed', None)。
+        """
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        try:
+            resp = await self._get_uncached(meta['url'], self.MAX_ICON_BYTES, headers)
+        except Exception:
+            return 'failed', None
+        if resp.status == 304:
+            return 'not_modified', None
+        if self._looks_like_image(resp):
+            return 'modified', resp
+        return 'gone', None
+
+    async def _scan_uncached(self, page_url):
+        parser = IconLinkParser()
+
+        def feed(chunk):
+            parser.feed_bytes(chunk)
+            return parser.done or parser.bytes_seen >= self.HEAD_SCAN_BYTES
+
+        try:
+            resp = await self._get_uncached(page_url, self.HEAD_SCAN_BYTES, on_chunk=feed)
+        except Exception:
+            return False, []
+        if resp.status != 200:
+            return False, []
+        return True, parser.candidates(resp.url)
+
+    async def scan_icon_links(self, page_url):
+        """流式读取页面，只解析到 </head>（或字节预算用完），返回 (页面可用, 图标候选列表)。
+
+        同一页面的并发扫描共享一次请求。
+        """
+        return await self._shared('scan ' + page_url, lambda: self._scan_uncached(page_url))
+
+    async def _manifest_icons(self, manifest_url):
+        """读取 Web App Manifest 中的 icons，转换为与 <link> 相同格式的候选。"""
+        try:
+            resp = await self.get(manifest_url, self.HEAD_SCAN_BYTES)
+            if resp.status != 200 or resp.truncated:
+                return []
+            icons = json.loads(resp.body.decode('utf-8', 'ignore')).get('icons') or []
+        except Exception:
+            return []
+        result = []
+        for icon in icons:
+            if not isinstance(icon, dict) or not icon.get('src'):
+                continue
+            # maskable 图标带大面积安全边距，不适合直接显示
+            if 'any' not in str(icon.get('purpose', 'any')).split():
+                continue
+            result.append({
+                'href': urllib.parse.urljoin(resp.url, str(icon['src']).strip()),
+                'rel': 'manifest-icon',
+                'sizes': str(icon.get('sizes', '')).strip().lower(),
+                'type': str(icon.get('type', '')).strip().lower(),
+            })
+        return result
+
+    async def _rank_candidates(self, page_url, candidates):
+        """对候选排序（附加隐式的站点 /favicon.ico）；最佳候选偏小且页面声明了 manifest 时，
+        合并 manifest 中的图标再排序。"""
+        origin = favicon_origin(page_url)
+        if origin:
+            candidates = candidates + [{'href': origin + '/favicon.ico', 'rel': 'icon', 'sizes': '', 'type': ''}]
+        ranked = rank_icon_candidates(candidates, self.target_px)
+        if not ranked or 0 < icon_candidate_px(ranked[0]) < self.target_px:
+            manifest = next((c['href'] for c in candidates if c['rel'] == 'manifest'), None)
+            if manifest:
+                extra = await self._manifest_icons(manifest)
+                if extra:
+                    ranked = rank_icon_candidates(candidates + extra, self.target_px)
+        return ranked
+
+    async def _download_best(self, ranked):
+        """依次下载排序后的候选，返回第一个成功的 (响应, 声明地址)；全部失败返回 (None, None)。"""
+        for c in ranked[:self.MAX_ICON_ATTEMPTS]:
+            resp = await self._get_image(c['href'])
+            if resp is not None:
+                return resp, c['href']
+        return None, None
+
+    async def _fetch_origin_uncached(self, origin, meta=None):
+        if meta and meta.get('url'):
+            state, resp = await self._revalidate(meta)
+            if state != 'gone':
+                return state, resp, meta.get('href')
+        # 首页声明的图标 + 隐式的 /favicon.ico（通常只有 16/32 像素），按目标尺寸排序后只下载最合适的
+        _ok, candidates = await self.scan_icon_links(origin + '/')
+        resp, href = await self._download_best(await self._rank_candidates(origin + '/', candidates))
+        if resp is not None:
+            return 'fetched', resp, href
+        return 'failed', None, None
+
+    async def fetch_origin(self, origin, meta=None):
+        """获取站点级图标，返回 (状态, 响应, 声明地址)；同一站点的并发调用只解析一次。
+
+        meta 为已缓存图标的校验信息（url/etag/last_modified），提供时先发条件请求；
+        状态为 'fetched' / 'modified' / 'not_modified' / 'failed'。
+        """
+        return await self._shared('origin ' + origin, lambda: self._fetch_origin_uncached(origin, meta))
+
+    async def _fetch_page(self, result, origin_icons, meta=None):
+        if meta and meta.get('url'):
+            state, resp = await self._revalidate(meta)
+            if state != 'gone':
+                return state, resp, meta.get('href')
+        ok, candidates = await self.scan_icon_links(result.url)
+        if not ok:
+            return 'failed', None, None
+        ranked = await self._rank_candidates(result.url, candidates)
+        if not ranked or ranked[0]['href'] in origin_icons:
+            return 'alias', None, None
+        resp, href = await self._download_best(ranked)
+        if resp is None or resp.url in origin_icons or href in origin_icons:
+            return ('failed' if resp is None else 'alias'), None, None
+        return 'fetched', resp, href
+
+    async def fetch(self, url, skip_origin=False, origin_meta=None, page_meta=None):
+        """获取页面 URL 的 FaviconResult。
+
+        站点图标从首页 <head> 声明的图标与 /favicon.ico 中按 target_px 挑选最合适的一个；
+        URL 有非根路径时额外扫描该页面，只有页面的最佳图标不同时才下载为页面级覆盖。skip_origin=True 表示站点图标已缓存且未过期；
+        origin_meta / page_meta 为过期缓存的校验信息，提供时改为条件请求。
+        """
+        result = FaviconResult(url)
+        if not result.origin:
+            return result
+        # 站点图标可能的地址（声明地址与重定向后的地址），页面声明相同图标时不算覆盖
+        origin_icons = {result.origin + '/favicon.ico'}
+        if origin_meta:
+            origin_icons.update(v for v in (origin_meta.get('url'), origin_meta.get('href')) if v)
+        if not skip_origin:
+            state, resp, href = await self.fetch_origin(result.origin, origin_meta)
+            result.origin_status = 'fetched' if state == 'modified' else state
+            if resp is not None:
+                result.origin_data = resp.body
+                result.origin_meta = self._validators(resp, href)
+                origin_icons.update(v for v in (resp.url, href) if v)
+        if result.page_key:
+            state, resp, href = await self._fetch_page(result, origin_icons, page_meta)
+            result.page_status = 'fetched' if state == 'modified' else state
+            if resp is not None:
+                result.page_data = resp.body
+                result.page_meta = self._validators(resp, href)
+        return result
+
+    async def fetch_many(self, urls, on_result=None, skip_origins=(), validators=None):
+        """并发获取多个 URL 的 favicon，返回 {url: FaviconResult}（超时未完成的为 None）。
+
+        on_result(url, result) 在每个 URL 完成时立即回调（在事件循环线程中）；
+        skip_origins 中的站点视为已缓存且未过期，不再请求站点图标；
+        validators 为 {站点或页面键: 校验信息}，用于过期缓存的条件请求。
+        """
+        validators = validators or {}
+        urls = list(dict.fromkeys(urls))
+        results = dict.fromkeys(urls)
+
+        async def run_one(u):
             try:
-                with urllib.request.urlopen(fav_url, timeout=timeout, context=ctx) as resp:
-                    data = resp.read()
-                    if data:
-                        return data
+                origin = favicon_origin(u)
+                result = await self.fetch(u, skip_origin=origin in skip_origins,
+                                          origin_meta=validators.get(origin),
+                                          page_meta=validators.get(favicon_page_key(u)))
             except Exception:
-                pass
+                result = FaviconResult(u)
+            results[u] = result
+            if on_result is not None:
+                try:
+                    on_result(u, result)
+                except Exception:
+                    pass
+
+        tasks = [asyncio.ensure_future(run_one(u)) for u in urls]
+        try:
+            if tasks:
+                _done, pending = await asyncio.wait(tasks, timeout=self.deadline)
+                for t in pending:
+                    t.cancel()
+                if pending:
+                    await asyncio.gather(*pending, return_exceptions=True)
+        finally:
+            await self.aclose()
+        return results
+
+
+def fetch_favicons(urls, on_result=None, skip_origins=(), validators=None, **kwargs):
+    """同步入口：在当前线程运行一个事件循环批量抓取 favicon（适合在工作线程中调用）。"""
+    async def main():
+        fetcher = FaviconFetcher(**kwargs)
+        return await fetcher.fetch_many(urls, on_result=on_result, skip_origins=skip_origins,
+                                        validators=validators)
+    return asyncio.run(main())
+
+
+def fetch_favicon_bytes(url, timeout=6):
+    """尝试获取 favicon 字节数据：页面级覆盖优先，否则为站点图标（首页声明的图标或 /favicon.ico）。"""
+    try:
+        result = fetch_favicons([url], timeout=timeout, deadline=timeout * 3).get(url)
+        return result.data if result else None
+    except Exception:
+        return None
+
+
+ICON_CACHE_DIR = os.path.join(os.path.dirname(__file__), 'icon_cache')
+ICON_CACHE_MANIFEST = 'index.json'
+
+# 缓存文件扩展名 -> 内容类型
+_ICON_CONTENT_TYPES = {
+    '.ico': 'image/x-icon',
+    '.png': 'image/png',
+    '.bmp': 'image/bmp',
+    '.gif': 'image/gif',
+    '.jpg': 'image/jpeg',
+    '.webp': 'image/webp',
+    '.svg': 'image/svg+xml',
+}
+
+
+class IconCacheIndex:
+    """icon_cache 目录的内存索引：key 的 sha1 -> 缓存条目。
 
-    return None
+    每个条目记录文件名、内容类型、字节数与抓取时间，网页图标还记录来源地址与
+    ETag / Last-Modified（用于过期后的条件请求）；抓取失败的 key 记录在 failures 中并指数退避。
+    全部持久化到 icon_cache/index.json。启动时构建一次，之后增量更新，查找不再扫描目录。
+    修改只标记为待写，SAVE_DELAY 秒内的多次修改合并为一次写入（批量抓取结束与进程退出时立即写入）。
+    """
 
+    # 默认过期时间（可通过 settings.json 的 favicon_ttl_hours 调整）
+    DEFAULT_TTL = 7 * 24 * 3600
+    # 失败退避：首次 10 分钟，之后翻倍，最长 7 天
+    RETRY_BASE = 10 * 60
+    RETRY_MAX = 7 * 24 * 3600
+    # 合并写入 manifest 的延迟（秒）
+    SAVE_DELAY = 1.0
+
+    def __init__(self, cache_dir=ICON_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.manifest_path = os.path.join(cache_dir, ICON_CACHE_MANIFEST)
+        self.ttl = self.DEFAULT_TTL
+        self._entries = {}
+        # key 的 sha1 -> {'count': 连续失败次数, 'next_retry': 时间戳}
+        self._failures = {}
+        self._lock = threading.Lock()
+        # 有未写入的修改；_save_timer 为已排队的合并写入
+        self._dirty = False
+        self._save_timer = None
+        # 串行化写文件（不与 _lock 共用，写盘期间查找不被阻塞）
+        self._write_lock = threading.Lock()
+
+    @staticmethod
+    def key_hash(key):
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+    def load(self):
+        """读取 manifest，并与目录中的实际文件对账一次（补录旧文件、剔除已删除文件）。"""
+        entries = {}
+        failures = {}
+        try:
+            if os.path.exists(self.manifest_path):
+                with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if isinstance(data, dict) and isinstance(data.get('entries'), dict):
+                    entries = {h: e for h, e in data['entries'].items() if isinstance(e, dict)}
+                if isinstance(data, dict) and isinstance(data.get('failures'), dict):
+                    failures = {h: f for h, f in data['failures'].items() if isinstance(f, dict)}
+        except Exception as e:
+            print(f"读取图标缓存索引失败，将重新扫描: {e}")
+            entries = {}
 
-def save_icon_bytes_to_cache(key, data):
+        try:
+            files = os.listdir(self.cache_dir) if os.path.isdir(self.cache_dir) else []
+        except Exception:
+            files = []
+        present = set(files)
+        changed = False
+        # 剔除文件已不存在的条目（别名条目没有文件）
+        for h, e in list(entries.items()):
+            if 'alias' not in e and e.get('file') not in present:
+                del entries[h]
+                changed = True
+        # 补录索引之外的旧缓存文件（文件名为 sha1 + 扩展名）
+        for fn in files:
+            h, ext = os.path.splitext(fn)
+            if len(h) != 40 or h in entries or ext.lower() not in _ICON_CONTENT_TYPES:
+                continue
+            try:
+                st = os.stat(os.path.join(self.cache_dir, fn))
+            except OSError:
+                continue
+            entries[h] = {
+                'file': fn,
+                'content_type': _ICON_CONTENT_TYPES[ext.lower()],
+                'size': st.st_size,
+                'fetched_at': st.st_mtime,
+            }
+            changed = True
+
+        with self._lock:
+            self._entries = entries
+            self._failures = failures
+        if changed:
+            self.save()
+
+    def save(self):
+        """标记 manifest 待写，并在 SAVE_DELAY 秒后合并写入一次。"""
+        with self._lock:
+            self._dirty = True
+            if self._save_timer is not None:
+                return
+            timer = threading.Timer(self.SAVE_DELAY, self.flush)
+            timer.daemon = True
+            self._save_timer = timer
+        timer.start()
+
+    def flush(self):
+        """立即写回尚未保存的修改：在锁内复制条目，在锁外原子地写文件（先写临时文件再替换）。"""
+        with self._write_lock:
+            with self._lock:
+                timer, self._save_timer = self._save_timer, None
+                if not self._dirty:
+                    return
+                self._dirty = False
+                data = {'version': 1, 'entries': dict(self._entries), 'failures': dict(self._failures)}
+            if timer is not None and timer is not threading.current_thread():
+                timer.cancel()
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                tmp_path = self.manifest_path + '.tmp'
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False)
+                os.replace(tmp_path, self.manifest_path)
+            except Exception as e:
+                print(f"保存图标缓存索引失败: {e}")
+
+    def has(self, key):
+        """key 是否有条目（含别名）。"""
+        with self._lock:
+            return self.key_hash(key) in self._entries
+
+    def lookup(self, key):
+        """返回 key 对应的缓存文件路径（跟随别名）；未缓存返回 None。"""
+        with self._lock:
+            entry = self._entries.get(self.key_hash(key))
+            if entry and 'alias' in entry:
+                entry = self._entries.get(entry['alias'])
+        if not entry or 'file' not in entry:
+            return None
+        return os.path.join(self.cache_dir, entry['file'])
+
+    def put_alias(self, key, target_key):
+        """登记 key 与 target_key 共用同一缓存文件（例如页面没有独立图标时指向站点图标）。"""
+        with self._lock:
+            self._entries[self.key_hash(key)] = {'alias': self.key_hash(target_key), 'fetched_at': time.time()}
+        self.save()
+
+    def put(self, key, fname, size, content_type, meta=None):
+        """登记新写入的缓存文件并持久化索引；meta 为来源地址与 ETag / Last-Modified。"""
+        h = self.key_hash(key)
+        entry = {
+            'file': fname,
+            'content_type': content_type,
+            'size': size,
+            'fetched_at': time.time(),
+        }
+        if meta:
+            entry.update({k: v for k, v in meta.items() if v})
+        with self._lock:
+            old = self._entries.get(h)
+            self._entries[h] = entry
+            self._failures.pop(h, None)
+        if old and old.get('file') and old['file'] != fname:
+            # 新图标格式不同（扩展名变化），删除旧文件
+            try:
+                os.remove(os.path.join(self.cache_dir, old['file']))
+            except OSError:
+                pass
+        self.save()
+
+    def validators(self, key):
+        """返回 key 条目的条件请求信息（url/href/etag/last_modified）；没有则返回 None。"""
+        with self._lock:
+            entry = self._entries.get(self.key_hash(key))
+            if not entry:
+                return None
+            return {k: entry.get(k) for k in ('url', 'href', 'etag', 'last_modified')}
+
+    def touch(self, key):
+        """条件请求返回 304：刷新抓取时间。"""
+        h = self.key_hash(key)
+        with self._lock:
+            entry = self._entries.get(h)
+            if entry is None:
+                return
+            entry['fetched_at'] = time.time()
+            self._failures.pop(h, None)
+        self.save()
+
+    def is_stale(self, key):
+        """key 的条目是否已超过 TTL（没有条目也视为过期）。"""
+        with self._lock:
+            entry = self._entries.get(self.key_hash(key))
+        if not entry:
+            return True
+        return time.time() - entry.get('fetched_at', 0) > self.ttl
+
+    def record_failure(self, key):
+        """记录一次抓取失败，按指数退避计算下次允许重试的时间。"""
+        h = self.key_hash(key)
+        with self._lock:
+            count = self._failures.get(h, {}).get('count', 0) + 1
+            delay = min(self.RETRY_MAX, self.RETRY_BASE * (2 ** (count - 1)))
+            self._failures[h] = {'count': count, 'next_retry': time.time() + delay}
+        self.save()
+
+    def in_backoff(self, key):
+        """key 最近抓取失败且仍在退避期内。"""
+        with self._lock:
+            failure = self._failures.get(self.key_hash(key))
+        return bool(failure) and failure.get('next_retry', 0) > time.time()
+
+
+_icon_cache_index = None
+_icon_cache_index_lock = threading.Lock()
+
+
+def get_icon_cache_index():
+    """返回进程内共享的图标缓存索引，首次调用时从磁盘构建。"""
+    global _icon_cache_index
+    with _icon_cache_index_lock:
+        if _icon_cache_index is None:
+            index = IconCacheIndex()
+            index.load()
+            # 退出前写回尚在合并等待中的修改
+            atexit.register(index.flush)
+            _icon_cache_index = index
+        return _icon_cache_index
+
+
+def lookup_favicon(url):
+    """按 页面覆盖 -> 站点 -> 完整 URL（旧版缓存）的顺序查找 URL 的缓存图标路径。"""
+    index = get_icon_cache_index()
+    page_key = favicon_page_key(url)
+    if page_key:
+        found = index.lookup(page_key)
+        if found:
+            return found
+    origin = favicon_origin(url)
+    return (origin and index.lookup(origin)) or index.lookup(url)
+
+
+def favicon_state(url):
+    """返回 (状态, 缓存路径)。
+
+    'missing' 需要联网解析；'stale' 已缓存但超过 TTL，需要条件请求；
+    'fresh' 已缓存且可直接使用；'backoff' 最近抓取失败，退避期内不再联网。
+    """
+    index = get_icon_cache_index()
+    path = lookup_favicon(url)
+    origin = favicon_origin(url)
+    page_key = favicon_page_key(url)
+    if path is None or (page_key and not index.has(page_key)):
+        failed_key = page_key if path is not None else origin
+        if failed_key and index.in_backoff(failed_key):
+            return 'backoff', path
+        return 'missing', path
+    if index.in_backoff(origin) or (page_key and index.in_backoff(page_key)):
+        return 'fresh', path
+    if index.is_stale(origin) or (page_key and index.is_stale(page_key)):
+        return 'stale', path
+    return 'fresh', path
+
+
+def save_icon_bytes_to_cache(key, data, meta=None):
     try:
-        cache_dir = os.path.join(os.path.dirname(__file__), 'icon_cache')
+        index = get_icon_cache_index()
+        cache_dir = index.cache_dir
         os.makedirs(cache_dir, exist_ok=True)
-        h = hashlib.sha1(key.encode('utf-8')).hexdigest()
+        h = IconCacheIndex.key_hash(key)
         # try to guess extension from header bytes
         ext = '.ico'
         if data[:8].startswith(b'\x89PNG'):
@@ -213,55 +1135,74 @@ def save_icon_bytes_to_cache(key, data):
             ext = '.bmp'
         elif data[:3] == b'GIF':
             ext = '.gif'
+        elif data[:3] == b'\xff\xd8\xff':
+            ext = '.jpg'
+        elif data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+            ext = '.webp'
+        elif b'<svg' in data[:1024]:
+            ext = '.svg'
         fname = h + ext
         fpath = os.path.join(cache_dir, fname)
         with open(fpath, 'wb') as f:
             f.write(data)
+        index.put(key, fname, len(data), _ICON_CONTENT_TYPES[ext], meta)
         return fpath
     except Exception:
         return None
 
 
-def _get_pixmap_for_icon_key(icon_key, btn_size):
-    """根据 icon_key（可能是文件路径或 URL 或特殊 combo key）返回 QPixmap。
-    如果找不到图标，返回一个带首字母的占位 pixmap。
-    """
-    try:
-        # 如果已经存在于全局或 Launcher 的 icon_cache，会在调用处优先使用
-        # 这里回退到尝试从文件提取或生成占位
-        if os.path.exists(icon_key):
-            icon = extract_qicon_from_file(icon_key)
-            if not icon.isNull():
-                pix = icon.pixmap(int(btn_size*0.8), int(btn_size*0.8))
-                return pix
-    except Exception:
-        pass
-
-    # 无法提取时创建占位
+def _placeholder_image(icon_key, size):
+    """生成一个带首字母的占位图（QImage，可在工作线程中绘制）。"""
     try:
-        pix = QPixmap(btn_size, btn_size)
-        pix.fill(QColor(255, 255, 255, 0))
-        painter = QPainter(pix)
+        img = QImage(size, size, QImage.Format.Format_ARGB32_Premultiplied)
+        img.fill(QColor(255, 255, 255, 0))
+        painter = QPainter(img)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         # 背景圆角矩形
         brush = QBrush(QColor(240, 240, 240))
         painter.setBrush(brush)
         painter.setPen(Qt.PenStyle.NoPen)
-        rect = pix.rect().adjusted(4, 4, -4, -4)
+        rect = img.rect().adjusted(4, 4, -4, -4)
         painter.drawRoundedRect(rect, 10, 10)
         # 首字母
         text = os.path.basename(icon_key)[:1].upper() if icon_key else '?'
         painter.setPen(QColor(120, 120, 120))
-        fm = QFontMetrics(painter.font())
-        painter.drawText(pix.rect(), Qt.AlignmentFlag.AlignCenter, text)
+        painter.drawText(img.rect(), Qt.AlignmentFlag.AlignCenter, text)
         painter.end()
-        return pix
+        return img
     except Exception:
-        return QPixmap()
+        return QImage()
+
+
+def _combo_member_image(item, target_px=None):
+    """读取组合成员的图片：QImage 原样返回；字符串为本地图片文件或已缓存的图标
+    （多帧 ICO 取最接近 target_px 的一帧并直接按该尺寸解码），找不到返回 None。"""
+    if isinstance(item, QImage):
+        return item
+    key = str(item)
+    if os.path.exists(key):
+        path = key
+    elif key.lower().startswith(('http://', 'https://')):
+        path = lookup_favicon(key)
+    else:
+        path = get_icon_cache_index().lookup(key)
+    if not path:
+        return None
+    img = _decode_icon_image(path, None, target_px)
+    return None if img.isNull() else img
+
 
+def generate_combo_icon(icon_items, size=112, dpr=1.0):
+    """根据 icon_items 生成一个拼贴组合图标，返回 QIcon（需在 GUI 线程调用）。"""
+    img = render_combo_image(icon_items, size, dpr)
+    return QIcon(QPixmap.fromImage(img)) if not img.isNull() else QIcon()
 
-def generate_combo_icon(icon_items, size=112):
-    """根据 icon_items 生成一个拼贴组合图标，返回 QIcon。
+
+def render_combo_image(icon_items, size=112, dpr=1.0):
+    """绘制组合图标，返回逻辑尺寸为 size、设备像素比为 dpr 的 QImage；失败返回空 QImage。
+
+    只使用 QImage / QPainter，可在工作线程中调用。icon_items 的元素为 QImage 或图标 key
+    （本地图片路径、URL 或缓存 key）；exe 等需要系统图标的成员应由 GUI 线程预先提取为 QImage。
     优化：增加背景容器，并强制图标在格子里居中显示。
     """
     try:
@@ -289,7 +1230,8 @@ def generate_combo_icon(icon_items, size=112):
         cell_w = (size - pad * (cols + 1)) // cols
         cell_h = (size - pad * (rows + 1)) // rows
 
-        out = QPixmap(size, size)
+        out = QImage(max(1, round(size * dpr)), max(1, round(size * dpr)), QImage.Format.Format_ARGB32_Premultiplied)
+        out.setDevicePixelRatio(dpr)
         out.fill(QColor(0, 0, 0, 0)) # 透明背景
         
         painter = QPainter(out)
@@ -304,14 +1246,14 @@ def generate_combo_icon(icon_items, size=112):
         painter.setBrush(QBrush(bg_color))
         painter.setPen(QPen(border_color, 2)) 
         # 绘制圆角矩形背景
-        rect = out.rect().adjusted(2, 2, -2, -2)
+        rect = QRect(0, 0, size, size).adjusted(2, 2, -2, -2)
         painter.drawRoundedRect(rect, 18, 18)
         
         # 添加文件夹顶部标签效果
         folder_tab_color = QColor(220, 220, 220, 180)
         painter.setBrush(QBrush(folder_tab_color))
         painter.setPen(QPen(border_color, 1))
-        tab_rect = QRect(rect.x() + rect.width() * 0.3, rect.y() - 8, rect.width() * 0.4, 16)
+        tab_rect = QRect(int(rect.x() + rect.width() * 0.3), rect.y() - 8, int(rect.width() * 0.4), 16)
         painter.drawRoundedRect(tab_rect, 8, 8)
 
         # --- 2. 绘制每个子图标 ---
@@ -324,53 +1266,746 @@ def generate_combo_icon(icon_items, size=112):
             y_cell = pad + r * (cell_h + pad)
             
             item = icon_items[idx]
-            pix = None
-            
-            # --- 获取图片逻辑 (保持原逻辑不变) ---
             try:
-                if isinstance(item, QPixmap):
-                    pix = item
-                elif isinstance(item, QIcon):
-                    pix = item.pixmap(cell_w, cell_h)
-                elif isinstance(item, str):
-                    key = item
-                    if os.path.exists(key):
-                        pix = QPixmap(key)
-                    else:
-                        # 尝试从缓存加载
-                        cache_dir = os.path.join(os.path.dirname(__file__), 'icon_cache')
-                        if os.path.isdir(cache_dir):
-                            h = hashlib.sha1(key.encode('utf-8')).hexdigest()
-                            for fn in os.listdir(cache_dir):
-                                if fn.startswith(h):
-                                    pix = QPixmap(os.path.join(cache_dir, fn))
-                                    break
+                img = _combo_member_image(item, round(max(cell_w, cell_h) * dpr))
             except Exception:
-                pix = None
+                img = None
 
             # 如果没找到图，生成首字母占位
-            if pix is None or pix.isNull():
-                pix = _get_pixmap_for_icon_key(str(item), max(cell_w, cell_h))
+            if img is None or img.isNull():
+                img = _placeholder_image('' if isinstance(item, QImage) else str(item), max(cell_w, cell_h))
 
             # --- 绘制逻辑 (核心优化) ---
-            if pix and not pix.isNull():
-                # 1. 按比例缩放到适合格子的大小
-                scaled_pix = pix.scaled(cell_w, cell_h, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+            if not img.isNull():
+                # 1. 按比例缩放到适合格子的大小（按物理像素缩放，高分屏下保持清晰）
+                scaled = img.scaled(round(cell_w * dpr), round(cell_h * dpr), Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+                scaled.setDevicePixelRatio(dpr)
+                w = round(scaled.width() / dpr)
+                h = round(scaled.height() / dpr)
                 
                 # 2. 计算居中偏移量 (重要步骤，防止图标飘在左上角)
-                off_x = (cell_w - scaled_pix.width()) // 2
-                off_y = (cell_h - scaled_pix.height()) // 2
+                off_x = (cell_w - w) // 2
+                off_y = (cell_h - h) // 2
                 
                 # 3. 绘制
                 target_x = x_cell + off_x
                 target_y = y_cell + off_y
-                painter.drawPixmap(target_x, target_y, scaled_pix)
+                painter.drawImage(target_x, target_y, scaled)
 
         painter.end()
-        return QIcon(out)
+        return out
     except Exception as e:
         print(f"Combo icon error: {e}")
-        return QIcon()
+        return QImage()
+
+
+COMBO_CACHE_DIR = os.path.join(ICON_CACHE_DIR, 'combos')
+
+
+def _combo_member_source(key):
+    """组合成员实际用于绘制的图片文件 (路径, 修改时间, 大小)；没有图片（绘制首字母占位）返回 None。"""
+    try:
+        if os.path.exists(key):
+            path = key
+        elif key.lower().startswith(('http://', 'https://')):
+            path = lookup_favicon(key)
+        else:
+            path = get_icon_cache_index().lookup(key)
+        if not path:
+            return None
+        st = os.stat(path)
+        return path, st.st_mtime_ns, st.st_size
+    except Exception:
+        return None
+
+
+def _needs_system_icon(key):
+    """本地存在但不是图片的成员（exe / lnk / 目录等）只能在 GUI 线程通过系统图标接口提取。"""
+    if not key or not os.path.exists(key):
+        return False
+    ext = os.path.splitext(key)[1][1:].lower()
+    return os.path.isdir(key) or ext not in _icon_decodable_formats()
+
+
+class ComboIconCache:
+    """组合图标的渲染缓存：内存 + icon_cache/combos 下的 PNG。
+
+    键为 combo_key + 尺寸 + 设备像素比；条目附带成员图片文件的签名（路径、修改时间、大小），
+    只有某个成员的图标变化时才重新绘制，重绘后旧的 PNG 随即删除。
+    磁盘上每个 (combo_key, 尺寸, dpr) 当前对应的文件名记在内存中，首次写盘时扫描一次目录建立，之后增量维护。
+    内存部分（QIcon）只在 GUI 线程访问；读盘与绘制（QImage）由 render_image 在工作线程完成。
+    """
+
+    def __init__(self, cache_dir=COMBO_CACHE_DIR):
+        self.cache_dir = cache_dir
+        # (combo_key, size, dpr) -> (签名, QIcon)
+        self._mem = {}
+        # 已提交绘制、尚未回到 GUI 线程的条目：(combo_key, size, dpr) -> 签名
+        self._pending = {}
+        # 文件名前缀 -> 磁盘上的 PNG 文件名；None 表示尚未扫描（工作线程写盘，由 _files_lock 保护）
+        self._files = None
+        self._files_lock = threading.Lock()
+
+    @staticmethod
+    def signature(members):
+        sources = [_combo_member_source(str(k)) for k in members[:9]]
+        return hashlib.sha1(repr(sources).encode('utf-8')).hexdigest()[:16]
+
+    @staticmethod
+    def _file_prefix(combo_key, size, dpr):
+        return hashlib.sha1(f"{combo_key}|{size}|{dpr:g}".encode('utf-8')).hexdigest()
+
+    def lookup(self, combo_key, members, size, dpr=1.0):
+        """查内存缓存，返回 (QIcon 或 None, 签名, 旧图标或 None)；成员变化时旧图标可作为占位。"""
+        sig = self.signature(members)
+        hit = self._mem.get((combo_key, size, dpr))
+        if hit is not None and hit[0] == sig:
+            return hit[1], sig, None
+        return None, sig, (hit[1] if hit is not None else None)
+
+    def begin(self, combo_key, size, dpr, sig):
+        self._pending[(combo_key, size, dpr)] = sig
+
+    def finish(self, combo_key, size, dpr, icon):
+        """GUI 线程：登记 render_image 的结果；尺寸已被更新的请求取代时返回 False。"""
+        sig = self._pending.pop((combo_key, size, dpr), None)
+        if sig is None:
+            return False
+        self._mem[(combo_key, size, dpr)] = (sig, icon)
+        return True
+
+    def _scan_files(self):
+        """扫描一次缓存目录，得到每个前缀当前的文件名（调用方持有 _files_lock）。"""
+        files = {}
+        try:
+            names = os.listdir(self.cache_dir) if os.path.isdir(self.cache_dir) else []
+        except OSError:
+            names = []
+        for fn in names:
+            prefix, sep, rest = fn.partition('_')
+            if sep and rest.endswith('.png'):
+                files[prefix] = fn
+        return files
+
+    def _save(self, prefix, sig, img):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fname = f"{prefix}_{sig}.png"
+            with self._files_lock:
+                if self._files is None:
+                    self._files = self._scan_files()
+                old = self._files.get(prefix)
+                self._files[prefix] = fname
+            if old and old != fname:
+                try:
+                    os.remove(os.path.join(self.cache_dir, old))
+                except OSError:
+                    pass
+            img.save(os.path.join(self.cache_dir, fname), 'PNG')
+        except Exception as e:
+            print(f"保存组合图标缓存失败: {e}")
+
+    def render_image(self, combo_key, items, size, dpr, sig):
+        """工作线程：读取磁盘缓存，未命中时绘制并写盘，返回 QImage。"""
+        prefix = self._file_prefix(combo_key, size, dpr)
+        fpath = os.path.join(self.cache_dir, f"{prefix}_{sig}.png")
+        img = QImage(fpath) if os.path.exists(fpath) else QImage()
+        if not img.isNull():
+            img.setDevicePixelRatio(dpr)
+            return img
+        img = render_combo_image(items, size, dpr)
+        if not img.isNull():
+            self._save(prefix, sig, img)
+        return img
+
+
+_combo_icon_cache = None
+
+
+def get_combo_icon_cache():
+    global _combo_icon_cache
+    if _combo_icon_cache is None:
+        _combo_icon_cache = ComboIconCache()
+    return _combo_icon_cache
+
+LAUNCH_HISTORY_PATH = os.path.join(os.path.dirname(__file__), 'launch_history.jsonl')
+
+
+def launch_key(app):
+    """应用在启动记录中的键：普通应用为 path，组合为按成员路径生成的键。"""
+    if app.get('combo'):
+        paths = []
+        for m in app['combo']:
+            paths.append((m.get('path') or m.get('name') or '') if isinstance(m, dict) else str(m))
+        return 'combo:' + hashlib.sha1('|'.join(paths).encode('utf-8')).hexdigest()
+    return app.get('path') or ''
+
+
+class LaunchHistory:
+    """启动记录：每个应用的启动次数与最近几次启动时间，用于计算 frecency（频率 × 近期程度）。
+
+    持久化为追加写入的 JSON Lines 文件，每行 {"k": 键, "n": 次数, "t": [时间戳...]}；
+    每次启动只追加一行，读取时按键合并。追加的行数超过 COMPACT_EVERY 时整体改写为每键一行。
+    """
+
+    # 每个键保留的最近启动时间数量
+    SAMPLES = 10
+    # 追加这么多行后压缩一次
+    COMPACT_EVERY = 200
+    # 近期权重：(距今天数上限, 权重)，超过最后一档按 OLD_WEIGHT 计
+    RECENCY_WEIGHTS = ((4, 100), (14, 70), (31, 50), (90, 30))
+    OLD_WEIGHT = 10
+
+    def __init__(self, path=LAUNCH_HISTORY_PATH):
+        self.path = path
+        # 键 -> [次数, 最近启动时间列表（升序）]
+        self._entries = {}
+        self._appended = 0
+        # 键 -> 分数；记录新启动或跨天后清空
+        self._scores = {}
+        self._scores_day = None
+        # 按分数从高到低排列的键（见 top），与 _scores 一起失效
+        self._top = None
+
+    def _merge(self, key, count, stamps):
+        entry = self._entries.setdefault(key, [0, []])
+        entry[0] += count
+        entry[1] = sorted(entry[1] + stamps)[-self.SAMPLES:]
+
+    def load(self):
+        self._entries = {}
+        lines = 0
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            rec = json.loads(line)
+                            self._merge(str(rec['k']), int(rec.get('n', 1)),
+                                        [float(t) for t in rec.get('t', [])])
+                        except (ValueError, KeyError, TypeError):
+                            # 跳过写了一半的行
+                            continue
+                        lines += 1
+        except Exception as e:
+            print(f"读取启动记录失败: {e}")
+        self._appended = lines - len(self._entries)
+        self._scores = {}
+        self._top = None
+        if self._appended > self.COMPACT_EVERY:
+            self.compact()
+
+    def record(self, key, when=None):
+        """记录一次启动：更新内存并向文件追加一行。"""
+        if not key:
+            return
+        when = time.time() if when is None else when
+        self._merge(key, 1, [when])
+        self._scores.pop(key, None)
+        self._top = None
+        try:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({'k': key, 'n': 1, 't': [round(when, 1)]}, ensure_ascii=False) + '\n')
+            self._appended += 1
+        except Exception as e:
+            print(f"写入启动记录失败: {e}")
+            return
+        if self._appended > self.COMPACT_EVERY:
+            self.compact()
+
+    def compact(self):
+        """把文件改写为每键一行（先写临时文件再替换）。"""
+        try:
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for key, (count, stamps) in self._entries.items():
+                    f.write(json.dumps({'k': key, 'n': count, 't': [round(t, 1) for t in stamps]},
+                                       ensure_ascii=False) + '\n')
+            os.replace(tmp_path, self.path)
+            self._appended = 0
+        except Exception as e:
+            print(f"压缩启动记录失败: {e}")
+
+    def score(self, key, now=None):
+        """frecency 分数：启动次数 × 最近几次启动的平均近期权重；没有记录为 0。"""
+        now = time.time() if now is None else now
+        day = int(now // 86400)
+        if day != self._scores_day:
+            self._scores = {}
+            self._scores_day = day
+            self._top = None
+        hit = self._scores.get(key)
+        if hit is not None:
+            return hit
+        entry = self._entries.get(key)
+        value = 0.0
+        if entry and entry[1]:
+            total = 0
+            for t in entry[1]:
+                days = (now - t) / 86400
+                total += next((w for limit, w in self.RECENCY_WEIGHTS if days <= limit), self.OLD_WEIGHT)
+            value = entry[0] * total / len(entry[1])
+        self._scores[key] = value
+        return value
+
+    def top(self, limit, now=None):
+        """分数最高的 limit 个键（不含 0 分），从高到低；排序结果缓存到下一次记录启动或跨天。"""
+        now = time.time() if now is None else now
+        if self._top is None or int(now // 86400) != self._scores_day:
+            scores = {key: self.score(key, now) for key in self._entries}
+            self._top = sorted((k for k, v in scores.items() if v > 0), key=lambda k: -scores[k])
+        return self._top[:limit]
+
+
+_launch_history = None
+
+
+def get_launch_history():
+    global _launch_history
+    if _launch_history is None:
+        _launch_history = LaunchHistory()
+        _launch_history.load()
+    return _launch_history
+
+# GB2312 一级汉字按拼音排序，每个声母首字母对应一段连续编码（i/u/v 没有汉字）
+_GB2312_INITIAL_STARTS = [
+    0xB0A1, 0xB0C5, 0xB2C1, 0xB4EE, 0xB6EA, 0xB7A2, 0xB8C1, 0xB9FE, 0xBBF7, 0xBFA6, 0xC0AC, 0xC2E8,
+    0xC4C3, 0xC5B6, 0xC5BE, 0xC6DA, 0xC8BB, 0xC8F6, 0xCBFA, 0xCDDA, 0xCEF4, 0xD1B9, 0xD4D1,
+]
+_GB2312_INITIALS = 'abcdefghjklmnopqrstwxyz'
+_GB2312_LEVEL1_END = 0xD7F9
+
+
+def _is_hanzi(ch):
+    return '\u4e00' <= ch <= '\u9fff'
+
+
+def hanzi_initial(ch):
+    """一级常用汉字的拼音首字母；其他字符返回 None。"""
+    try:
+        code = ch.encode('gb2312')
+    except UnicodeEncodeError:
+        return None
+    if len(code) != 2:
+        return None
+    value = code[0] << 8 | code[1]
+    if not _GB2312_INITIAL_STARTS[0] <= value <= _GB2312_LEVEL1_END:
+        return None
+    return _GB2312_INITIALS[bisect.bisect_right(_GB2312_INITIAL_STARTS, value) - 1]
+
+
+def pinyin_keys(text):
+    """返回 (完整拼音, 拼音首字母)，均为小写且不含空格；不含汉字时返回空串。
+
+    没有安装 pypinyin 时完整拼音为空串，首字母按 GB2312 编码区间推算（生僻字保留原字符）。
+    """
+    if not any(_is_hanzi(ch) for ch in text):
+        return '', ''
+    if lazy_pinyin is not None:
+        full = ''.join(lazy_pinyin(text)).replace(' ', '').lower()
+        initials = ''.join(lazy_pinyin(text, style=PinyinStyle.FIRST_LETTER)).replace(' ', '').lower()
+        return full, initials
+    initials = ''.join(hanzi_initial(ch) or ch for ch in text if not ch.isspace()).lower()
+    return '', initials
+
+
+class AppSearchIndex:
+    """应用搜索索引：名称、拼音、拼音首字母、路径文件名、网址主机名与组合成员名称。
+
+    每个应用的检索词只在应用加入索引或被 touch() 标记修改时计算一次（拼音转换是主要开销）。
+    每类字段维护两种结构，都随应用增删改增量更新：
+    - 按检索词排序的数组：前缀与完全相等的查询用二分查找直接得到命中范围；
+    - 按 self.apps 顺序分块拼接的大串（检索词以 \\x00 分隔）：子串查询用 str.find 在 C 层扫描，
+      再按偏移量二分找到所属应用；应用增删、改名或移动时只重新拼接所在的块。
+    结果按命中等级排序：同等级中最常用的应用（由调用方按 frecency 给出）在前，其余保持 self.apps 中的顺序。
+    各等级依次查找，凑满 RESULT_LIMIT 个结果即停止，查询耗时不随命中数量增长。
+    完整拼音匹配需要可选依赖 pypinyin，未安装时中文名称只能按拼音首字母搜索。
+    """
+
+    NAME, PINYIN, OTHER = 'name', 'pinyin', 'other'
+    FIELDS = (NAME, PINYIN, OTHER)
+    # 命中等级从高到低：名称完全相等、名称前缀、拼音前缀、名称子串、拼音子串、其他前缀、其他子串
+    PASSES = ((NAME, 'exact'), (NAME, 'prefix'), (PINYIN, 'prefix'), (NAME, 'substring'),
+              (PINYIN, 'substring'), (OTHER, 'prefix'), (OTHER, 'substring'))
+    # 每块最多的应用数量
+    BLOCK_SIZE = 256
+    # 一次查询最多返回的结果数
+    RESULT_LIMIT = 200
+    # 调用方给出的常用应用最多取这么多个，在各自的命中等级内排在前面
+    PREFERRED_LIMIT = 64
+    # 一次同步增删的应用超过该数量时，直接重新排序检索词数组，不再逐个插入、删除
+    BULK_CHANGE = 512
+
+    def __init__(self, rank_key=None):
+        # rank_key(app) -> 常用应用的键（如启动记录的键），search 的 preferred 按此键给出
+        self._rank_key = rank_key
+        # id(app) -> (app, {字段: [检索词]}, 排序键)
+        self._entries = {}
+        # 字段 -> {id(app): 该字段的检索词拼成的串，每个检索词前加 \x00}；_text 为三类字段合在一起的串
+        self._blobs = {field: {} for field in self.FIELDS}
+        self._text = {}
+        # 字段 -> (排好序的检索词, 对应的 id(app))
+        self._sorted = {field: ([], []) for field in self.FIELDS}
+        # 排序键 -> [app, ...]
+        self._by_key = {}
+        self._apps = []
+        self._ids = []
+        # 各块为 [apps, ids, {字段: (拼接后的串, 各应用起始偏移 + 结尾偏移, 二元组位图)}]；
+        # _block_starts 为各块首个应用在 _apps 中的下标，_block_of 为 id(app) -> (所在的块, 块内下标)
+        self._blocks = []
+        self._block_starts = []
+        self._block_of = {}
+        # 被 touch() 标记为已修改的应用
+        self._touched = set()
+        # self.apps 变化后置为 True，下次查询前增量同步
+        self.stale = True
+        # 上一次查询：(查询词, [(次序键, app), ...], 是否完整)；新查询是它的延伸时只在这些应用中继续筛选
+        self._last = None
+
+    @staticmethod
+    def _member_names(app):
+        names = []
+        for m in app.get('combo') or []:
+            if isinstance(m, dict):
+                names.append(m.get('name', '') or '')
+            else:
+                names.append(os.path.basename(str(m)))
+        return names
+
+    @classmethod
+    def app_terms(cls, app):
+        """计算一个应用的检索词：{字段: [小写检索词]}。"""
+        name = (app.get('name', '') or '').lower()
+        terms = {cls.NAME: [name], cls.PINYIN: [], cls.OTHER: []}
+        full, initials = pinyin_keys(name)
+        words = name.split()
+        if len(words) > 1:
+            # 英文名称的单词首字母，如 Visual Studio Code -> vsc
+            terms[cls.PINYIN].append(''.join(w[0] for w in words))
+        terms[cls.PINYIN].extend(t for t in (full, initials) if t)
+        path = app.get('path') or ''
+        if path.lower().startswith(('http://', 'https://')):
+            host = (urllib.parse.urlsplit(path).hostname or '').lower()
+            terms[cls.OTHER].append(host[4:] if host.startswith('www.') else host)
+        elif path:
+            terms[cls.OTHER].append(os.path.splitext(os.path.basename(path.rstrip('\\/')))[0].lower())
+        for member in cls._member_names(app):
+            member = member.lower()
+            terms[cls.OTHER].append(member)
+            terms[cls.OTHER].extend(t for t in pinyin_keys(member) if t)
+        for field in cls.FIELDS:
+            terms[field] = [t for t in terms[field] if t]
+        return terms
+
+    # 未安装 pypinyin 的提示只打印一次
+    _pinyin_notice_shown = False
+
+    def _entry(self, app):
+        """返回应用的缓存条目，没有时计算检索词（只计算，不加入索引）。"""
+        hit = self._entries.get(id(app))
+        if hit is not None and hit[0] is app:
+            return hit
+        if lazy_pinyin is None and not AppSearchIndex._pinyin_notice_shown:
+            if any(_is_hanzi(ch) for ch in (app.get('name', '') or '')):
+                AppSearchIndex._pinyin_notice_shown = True
+                print("未安装 pypinyin，中文名称只能按拼音首字母搜索；pip install pypinyin 后可按完整拼音搜索。")
+        terms = self.app_terms(app)
+        hit = (app, terms, self._rank_key(app) if self._rank_key is not None else None)
+        self._entries[id(app)] = hit
+        for field in self.FIELDS:
+            self._blobs[field][id(app)] = ''.join('\x00' + t for t in terms[field])
+        self._text[id(app)] = ''.join(self._blobs[field][id(app)] for field in self.FIELDS)
+        return hit
+
+    def _add(self, app, sort_terms=True):
+        """把应用加入按键查找的表；sort_terms 为 False 时由调用方随后整体重排检索词数组。"""
+        app_id = id(app)
+        _, terms, key = self._entry(app)
+        self._by_key.setdefault(key, []).append(app)
+        if sort_terms:
+            for field in self.FIELDS:
+                words, owners = self._sorted[field]
+                for term in terms[field]:
+                    k = bisect.bisect_right(words, term)
+                    words.insert(k, term)
+                    owners.insert(k, app_id)
+
+    def _remove(self, app_id, sort_terms=True):
+        """把应用移出索引并丢弃它的检索词缓存；sort_terms 为 False 时由调用方随后整体重排检索词数组。"""
+        hit = self._entries.pop(app_id, None)
+        self._block_of.pop(app_id, None)
+        self._text.pop(app_id, None)
+        if hit is None:
+            return
+        app, terms, key = hit
+        for field in self.FIELDS:
+            self._blobs[field].pop(app_id, None)
+            if not sort_terms:
+                continue
+            words, owners = self._sorted[field]
+            for term in terms[field]:
+                k = bisect.bisect_left(words, term)
+                while k < len(words) and words[k] == term:
+                    if owners[k] == app_id:
+                        del words[k]
+                        del owners[k]
+                        break
+                    k += 1
+        same = self._by_key.get(key)
+        if same is not None:
+            same[:] = [a for a in same if a is not app]
+            if not same:
+                del self._by_key[key]
+
+    def _resort_terms(self):
+        for field in self.FIELDS:
+            pairs = sorted((term, app_id) for app_id in self._ids
+                           for term in self._entries[app_id][1][field])
+            self._sorted[field] = ([p[0] for p in pairs], [p[1] for p in pairs])
+
+    def prepare(self, apps_iter, budget_ms=8):
+        """分批预先计算检索词（拼音转换较慢），每次最多约 budget_ms 毫秒；全部完成时返回 True。"""
+        deadline = time.perf_counter() + budget_ms / 1000.0
+        for app in apps_iter:
+            self._entry(app)
+            if time.perf_counter() >= deadline:
+                return False
+        return True
+
+    def touch(self, app):
+        """应用的名称、路径或成员被原地修改：下次同步时重新计算它的检索词。"""
+        self._touched.add(id(app))
+        self.stale = True
+
+    @staticmethod
+    def _common_prefix(a, b):
+        """a、b 开头相同部分的长度（按段比较切片，比较在 C 层完成）。"""
+        lo, hi = 0, min(len(a), len(b))
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if a[lo:mid] == b[lo:mid]:
+                lo = mid
+            else:
+                hi = mid - 1
+        return lo
+
+    def rebuild(self, apps):
+        """按 apps 的当前顺序同步索引。
+
+        与上次同步的顺序比较，找出首尾未变的部分，只为中间新增、删除、移动或被 touch() 的应用
+        更新检索词数组并重新拼接它们所在的块；其余的块原样保留。单个应用移动到远处时按先删后插处理。
+        """
+        apps = list(apps)
+        ids = list(map(id, apps))
+        old_ids = self._ids
+        n_old, n_new = len(old_ids), len(ids)
+        head = self._common_prefix(old_ids, ids)
+        tail = self._common_prefix(old_ids[head:][::-1], ids[head:][::-1])
+        # 被原地修改的应用即使位置不变，也要落在重新处理的范围内
+        touched, self._touched = self._touched, set()
+        for app_id in touched:
+            self._remove(app_id)
+            try:
+                pos = ids.index(app_id)
+            except ValueError:
+                continue
+            if n_old == n_new and head + tail >= n_new:
+                head, tail = pos, n_new - 1 - pos
+            else:
+                head, tail = min(head, pos), min(tail, n_new - 1 - pos)
+        if head == n_old == n_new:
+            self._apps = apps
+            self.stale = False
+            return
+        old_part = old_ids[head:n_old - tail]
+        new_part = ids[head:n_new - tail]
+        if len(old_part) == len(new_part) > self.BLOCK_SIZE and not touched:
+            # 单个应用从范围一端移到另一端：先在原位置删除，再在新位置插入，各只影响一块
+            if old_part[0] == new_part[-1] and old_part[1:] == new_part[:-1]:
+                self.rebuild(apps[:head] + apps[head:n_new - tail - 1] + apps[n_new - tail:])
+                self.rebuild(apps)
+                return
+            if old_part[-1] == new_part[0] and old_part[:-1] == new_part[1:]:
+                self.rebuild(apps[:head] + apps[head + 1:])
+                self.rebuild(apps)
+                return
+
+        old_set, new_set = set(old_part), set(new_part)
+        removed = old_set - new_set
+        added = (new_set - old_set) | (touched & new_set)
+        bulk = len(removed) + len(added) > self.BULK_CHANGE
+        for app_id in removed:
+            self._remove(app_id, sort_terms=not bulk)
+        for app in apps[head:n_new - tail]:
+            if id(app) in added:
+                self._add(app, sort_terms=not bulk)
+
+        # 重新拼接覆盖旧顺序中 [head, n_old - tail) 的块（纯插入时为插入点所在的块）
+        size = self.BLOCK_SIZE
+        blocks, starts = self._blocks, self._block_starts
+        if blocks:
+            first = bisect.bisect_right(starts, head) - 1
+            last = max(first, bisect.bisect_right(starts, n_old - tail - 1) - 1)
+            lo = starts[first]
+            hi = starts[last] + len(blocks[last][0])
+            # 删除后变得过小的块与后一块合并，避免碎片化
+            if hi - lo + n_new - n_old < size // 2 and last + 1 < len(blocks):
+                last += 1
+                hi += len(blocks[last][0])
+            hi += n_new - n_old
+        else:
+            first, last, lo, hi = 0, -1, 0, n_new
+        count = -(-(hi - lo) // size)
+        step = -(-(hi - lo) // count) if count else size
+        blocks[first:last + 1] = [self._make_block(apps[i:min(i + step, hi)], ids[i:min(i + step, hi)])
+                                  for i in range(lo, hi, step)]
+        self._block_starts = list(itertools.accumulate((len(b[0]) for b in blocks[:-1]), initial=0))
+        self._apps, self._ids = apps, ids
+        if bulk:
+            self._resort_terms()
+        self._last = None
+        self.stale = False
+
+    # 每块每类字段的二元组位图大小（位，取质数便于取模散列），用于跳过不可能含有查询词的块
+    GRAM_BITS = 8191
+
+    @classmethod
+    def _gram_mask(cls, text):
+        """text 中相邻两个字符组成的二元组在位图中对应的位。
+
+        按 UTF-16 编码后把每 4 字节（两个字符）当作一个整数读出，偶数、奇数起点各读一遍即得全部二元组，
+        逐字符的工作都在 C 层完成。
+        """
+        data = text.encode('utf-16-le', 'surrogatepass')
+        even = memoryview(data[:len(data) // 4 * 4]).cast('I')
+        odd = memoryview(data[2:2 + (len(data) - 2) // 4 * 4]).cast('I')
+        bits = bytearray(cls.GRAM_BITS // 8 + 1)
+        for k in set(map(cls.GRAM_BITS.__rmod__, itertools.chain(even, odd))):
+            bits[k >> 3] |= 1 << (k & 7)
+        return int.from_bytes(bits, 'little')
+
+    def _make_block(self, apps, ids):
+        hays = {}
+        for field in self.FIELDS:
+            parts = list(map(self._blobs[field].__getitem__, ids))
+            hay = ''.join(parts) + '\x00'
+            hays[field] = (hay, list(itertools.accumulate(map(len, parts), initial=0)), self._gram_mask(hay))
+        block = [apps, ids, hays]
+        self._block_of.update(zip(ids, zip(itertools.repeat(block), itertools.count())))
+        return block
+
+    @classmethod
+    def _patterns(cls, q, compact):
+        """各命中等级的 (字段, 匹配方式, 查询词, 在拼接串中要查找的子串)。"""
+        result = []
+        for field, how in cls.PASSES:
+            needle = compact if field == cls.PINYIN else q
+            pattern = {'exact': '\x00' + needle + '\x00', 'prefix': '\x00' + needle}.get(how, needle)
+            result.append((field, how, needle, pattern))
+        return result
+
+    def _tier(self, app_id, patterns):
+        """单个应用的命中等级（PASSES 中的序号）；不匹配返回 None。"""
+        text = self._text[app_id]
+        # 先用合在一起的串排除不含查询词的应用（名称与拼音两种查询词）
+        if patterns[0][2] not in text and patterns[2][2] not in text:
+            return None
+        for tier, (field, how, needle, pattern) in enumerate(patterns):
+            blob = self._blobs[field][app_id]
+            if needle in blob and pattern in blob + '\x00':
+                return tier
+        return None
+
+    # 上一次结果完整且不超过该数量时，延伸的查询只逐个检查这些应用，不再查找整个索引
+    NARROW_LIMIT = 64
+
+    def search(self, text, preferred=()):
+        """返回匹配 text 的应用（最多 RESULT_LIMIT 个），按命中等级排序。
+
+        preferred 为常用应用的排序键（rank_key 的返回值），从最常用开始；同等级中这些应用排在前面。
+        查询是上一次查询的延伸（如继续输入）时，结果必然是上一次结果的子集，只在其中继续筛选。
+        """
+        q = text.strip().lower().replace('\x00', '')
+        if not q:
+            self._last = None
+            return list(self._apps)
+        patterns = self._patterns(q, q.replace(' ', ''))
+        last = self._last
+        if last is not None and q.startswith(last[0]) and last[2] and len(last[1]) <= self.NARROW_LIMIT:
+            found, complete = self._narrow(last[1], patterns), True
+        else:
+            found, complete = self._scan(patterns, preferred)
+        self._last = (q, found, complete)
+        return [app for _, app in found]
+
+    def _narrow(self, candidates, patterns):
+        ranked = []
+        for order, app in candidates:
+            tier = self._tier(id(app), patterns)
+            if tier is not None:
+                ranked.append((tier, order, app))
+        ranked.sort(key=lambda r: r[:2])
+        return [(order, app) for _, order, app in ranked]
+
+    def _scan(self, patterns, preferred):
+        """按命中等级依次查找，返回 ([(次序键, app), ...], 是否完整)。"""
+        limit = self.RESULT_LIMIT
+        seen = set()
+        favored = []
+        for rank, key in enumerate(itertools.islice(preferred, self.PREFERRED_LIMIT)):
+            for app in self._by_key.get(key, ()):
+                if id(app) not in seen:
+                    seen.add(id(app))
+                    tier = self._tier(id(app), patterns)
+                    if tier is not None:
+                        favored.append((tier, rank, app))
+        favored.sort(key=lambda r: r[:2], reverse=True)
+        found = []
+        base_of = None
+        for tier, (field, how, needle, pattern) in enumerate(patterns):
+            while favored and favored[-1][0] == tier:
+                _, rank, app = favored.pop()
+                found.append(((0, rank), app))
+            if len(found) >= limit:
+                return found[:limit], False
+            if how != 'substring':
+                words, owners = self._sorted[field]
+                lo = bisect.bisect_left(words, needle)
+                if how == 'exact':
+                    hi = bisect.bisect_right(words, needle, lo)
+                else:
+                    hi = bisect.bisect_left(words, needle + '\U0010ffff', lo)
+                if hi - lo <= limit:
+                    # 命中较少：由检索词数组直接得到，再按在 self.apps 中的位置排序
+                    if base_of is None and hi > lo:
+                        base_of = {id(b): s for s, b in zip(self._block_starts, self._blocks)}
+                    hits = []
+                    for app_id in set(owners[lo:hi]) - seen:
+                        block, j = self._block_of[app_id]
+                        hits.append((base_of[id(block)] + j, block[0][j]))
+                    hits.sort(key=lambda h: h[0])
+                    seen.update(id(app) for _, app in hits)
+                    found.extend(((1, pos), app) for pos, app in hits)
+                    if len(found) >= limit:
+                        return found[:limit], False
+                    continue
+            # 子串查询，或命中很多的前缀查询：按 self.apps 顺序扫描各块，凑满即停止
+            mask = self._gram_mask(pattern)
+            for base, (apps, ids, hays) in zip(self._block_starts, self._blocks):
+                hay, offsets, grams = hays[field]
+                if grams & mask != mask:
+                    continue
+                pos = hay.find(pattern)
+                while pos != -1:
+                    j = bisect.bisect_right(offsets, pos) - 1
+                    if ids[j] not in seen:
+                        seen.add(ids[j])
+                        found.append(((1, base + j), apps[j]))
+                        if len(found) >= limit:
+                            return found, False
+                    # 同一应用只取最先命中的等级，直接跳到下一个应用
+                    pos = hay.find(pattern, offsets[j + 1])
+        return found, True
 
 DEBUG = False
 
@@ -381,6 +2016,8 @@ def dbg(*args, **kwargs):
 class FloatingBall(QWidget):
     def __init__(self):
         super().__init__()
+        # 启动时构建一次图标缓存索引，后续查找只查内存
+        get_icon_cache_index()
         # apps 列表会在 init_ui 之前通过 load_config 加载
         self.apps = []
         self.load_config()
@@ -388,6 +2025,9 @@ class FloatingBall(QWidget):
         self.init_ui()
         # icon cache shared across launcher windows
         self._global_icon_cache = {}
+        # 常驻的启动器窗口：预先构建好后隐藏，点击时直接显示
+        self._launcher = None
+        QTimer.singleShot(0, self._ensure_launcher)
         # 启动自动停靠计时器
         if self._auto_dock_enabled and not self._is_docked:
             self._auto_dock_timer.start(self._auto_dock_delay * 1000)
@@ -542,23 +2182,7 @@ class FloatingBall(QWidget):
                 if (not moved_flag) and is_same_button and within_click_distance:
                     # 重置自动停靠计时器
                     self._reset_auto_dock_timer()
-                    launcher = LauncherWindow(self.apps, launcher_callback=self.launch_app)
-                    launcher.show()
-                    # 延迟居中与首次布局，等待 Qt 完成初始布局计算
-                    def center_and_layout():
-                        try:
-                            launcher.rebuild_app_grid()
-                        except Exception:
-                            pass
-                        try:
-                            screen_geom = QApplication.primaryScreen().availableGeometry()
-                            x = screen_geom.x() + (screen_geom.width() - launcher.width()) // 2
-                            y = screen_geom.y() + (screen_geom.height() - launcher.height()) // 2
-                            launcher.move(x, y)
-                        except Exception as e:
-                            print(f"居中启动器失败: {e}")
-
-                    QTimer.singleShot(0, center_and_layout)
+                    self.show_launcher()
             except Exception as e:
                 print(f"打开启动器窗口失败: {e}")
             finally:
@@ -886,6 +2510,33 @@ class FloatingBall(QWidget):
         except Exception as e:
             print(f"自动停靠失败: {e}")
             
+    def _apps_config_path(self):
+        return os.path.join(os.path.dirname(__file__), 'apps.json')
+
+    def _ensure_launcher(self):
+        """构建常驻启动器窗口（隐藏状态下完成布局与网格），已存在时直接返回。"""
+        if self._launcher is None:
+            launcher = LauncherWindow(self.apps, launcher_callback=self.launch_app,
+                                      icon_cache=self._global_icon_cache)
+            launcher.persistent = True
+            launcher.apps_mtime = self._apps_mtime
+            launcher.prepare_hidden()
+            self._launcher = launcher
+        return self._launcher
+
+    def show_launcher(self):
+        """显示常驻启动器；apps.json 在外部被修改过时先增量同步。"""
+        launcher = self._ensure_launcher()
+        try:
+            mtime = os.path.getmtime(self._apps_config_path())
+        except OSError:
+            mtime = None
+        if mtime is not None and mtime != launcher.apps_mtime:
+            self.load_config()
+            launcher.apps_mtime = self._apps_mtime
+            launcher.sync_apps(self.apps)
+        launcher.present()
+
     def launch_app(self, path):
         """非阻塞启动外部程序（Windows 可执行文件）。
 
@@ -925,9 +2576,11 @@ class FloatingBall(QWidget):
             {"name": "记事本", "path": "C:\\Windows\\System32\\notepad.exe"}
         ]
         """
-        config_path = os.path.join(os.path.dirname(__file__), 'apps.json')
+        config_path = self._apps_config_path()
+        self._apps_mtime = None
         try:
             if os.path.exists(config_path):
+                self._apps_mtime = os.path.getmtime(config_path)
                 with open(config_path, 'r', encoding='utf-8') as f:
                     data = json.load(f)
                     if isinstance(data, list):
@@ -974,7 +2627,10 @@ class DragButton(QPushButton):
 
 
 class AppCell(QWidget):
-    """单个应用单元：包含可拖动的按钮与名称标签，支持作为 drop 目标。"""
+    """单个应用单元：包含可拖动的按钮与名称标签，支持作为 drop 目标。
+
+    通过 bind() 可以把同一个单元重新绑定到另一个应用（虚拟化网格滚动时回收复用）。
+    """
     def __init__(self, app, parent_window, btn_size, parent=None):
         super().__init__(parent)
         self.app = app
@@ -988,7 +2644,6 @@ class AppCell(QWidget):
         layout.setSpacing(6)
 
         self.btn = DragButton(drag_data=app.get('path',''))
-        self.btn.setFixedSize(btn_size, btn_size)
         self.btn.setCursor(Qt.CursorShape.PointingHandCursor)
         self.btn.setStyleSheet(f"""
             QPushButton {{
@@ -1010,18 +2665,33 @@ class AppCell(QWidget):
 
         lbl = QLabel()
         fm = QFontMetrics(lbl.font())
-        elided = fm.elidedText(app.get('name','Unnamed'), Qt.TextElideMode.ElideRight, btn_size + 8)
-        lbl.setText(elided)
         lbl.setAlignment(Qt.AlignmentFlag.AlignHCenter)
         lbl.setFixedHeight(fm.height() + 2)
         lbl.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
         layout.addWidget(lbl)
+        self.label = lbl
 
         # 把按钮的事件转交给本单元处理，以便整体拖动（但保持按钮的点击可用）
         self.btn.installEventFilter(self)
+        self.bind(app, btn_size)
+
+    def bind(self, app, btn_size):
+        """绑定（或重新绑定）到 app：更新按钮尺寸、拖拽数据与省略后的名称。"""
+        self.app = app
+        self._drag_start_pos = None
+        self._is_dragging = False
+        self.btn._drag_data = app.get('path', '')
+        self.btn.setFixedSize(btn_size, btn_size)
+        fm = QFontMetrics(self.label.font())
+        self.label.setText(fm.elidedText(app.get('name','Unnamed'), Qt.TextElideMode.ElideRight, btn_size + 8))
+
+    _FILTERED_EVENTS = (QEvent.Type.MouseButtonPress, QEvent.Type.MouseMove, QEvent.Type.MouseButtonRelease)
 
     def eventFilter(self, source, event):
-        # 仅处理来自子控件（主要是按钮）的鼠标按下/移动/释放，用以触发整体拖动
+        # 仅处理来自子控件（主要是按钮）的鼠标按下/移动/释放，用以触发整体拖动。
+        # 先按事件类型过滤：控件销毁过程中按钮仍会派发 Hide 等事件，此时不能读取单元的状态
+        if event.type() not in self._FILTERED_EVENTS:
+            return False
         if source is self.btn:
             if event.type() == QEvent.Type.MouseButtonPress and event.button() == Qt.MouseButton.LeftButton:
                 # 记录按下全局位置与当前组件位置
@@ -1037,8 +2707,8 @@ class AppCell(QWidget):
                     # 告知父窗口开始拖动
                     self.parent_window.start_drag(self, self._drag_start_pos)
                 if self._is_dragging:
-                    # 实时更新父窗口中被拖动单元的位置
-                    self.parent_window.update_drag(self, event.globalPosition().toPoint())
+                    # 交给父窗口按帧合并处理（每帧只处理最新位置）
+                    self.parent_window.queue_drag_move(self, event.globalPosition().toPoint())
                     return True
                 return False
 
@@ -1075,31 +2745,823 @@ class AppCell(QWidget):
         else:
             event.ignore()
     
-class LauncherWindow(QWidget):
-    """自定义圆角启动器窗口，居中显示，右上角有最小化/最大化/关闭按钮。"""
-    def __init__(self, apps, launcher_callback=None):
-        super().__init__(None)
-        self.apps = apps or []
-        self.launcher_callback = launcher_callback
-        self._maximized = False
-        self._prev_geometry = None
-        # 可配置的图标按钮尺寸（像素），修改此值可改变网格中图标大小
-        self.btn_size = 112
-        # icon cache: path -> QIcon
-        self.icon_cache = {}
-        # path -> list of QPushButton instances to update
-        self.path_buttons = {}
-        # set of paths currently loading
-        self.loading_set = set()
-        # keep threads references
-        self._threads = []
-        # 设置存储路径
-        self.settings_path = os.path.join(os.path.dirname(__file__), 'settings.json')
-        # 先加载配置以便初始化 UI 使用
-        self.load_settings()
-        self.init_ui()
+class AppListModel(QAbstractListModel):
+    """模型/视图网格引擎的数据模型：行即 launcher._order 的显示顺序，末尾附加一个“添加”行。
 
-    def init_ui(self):
+    图标直接从 launcher.icon_cache 读取；尚未缓存的图标在首次被绘制时合并为一次 _load_icons 请求。
+    """
+    AppRole = Qt.ItemDataRole.UserRole
+
+    def __init__(self, launcher, parent=None):
+        super().__init__(parent)
+        self.launcher = launcher
+        self._apps = []
+        # 每行用于取图标的 key（组合为 combo:sha1）
+        self._keys = []
+        # icon key -> 行号列表，图标加载完成后只刷新这些行
+        self._rows_by_key = {}
+        self._btn_size = None
+        self._pending_icons = []
+        self._pending_ids = set()
+        # 已提交过绘制请求的 (combo_key, 尺寸)
+        self._combo_requested = set()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid() or not self._apps:
+            return 0
+        return len(self._apps) + 1
+
+    def app_at(self, row):
+        """返回该行的 app；“添加”行或越界返回 None。"""
+        if 0 <= row < len(self._apps):
+            return self._apps[row]
+        return None
+
+    def is_add_row(self, row):
+        return bool(self._apps) and row == len(self._apps)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        app = self.app_at(row)
+        if app is None:
+            if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+                return '添加' if role == Qt.ItemDataRole.DisplayRole else '添加应用'
+            return None
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            return app.get('name', '') or ''
+        if role == Qt.ItemDataRole.DecorationRole:
+            return self._icon_for(row, app)
+        if role == self.AppRole:
+            return app
+        return None
+
+    def _icon_for(self, row, app):
+        key = self._keys[row]
+        if not key:
+            return None
+        launcher = self.launcher
+        icon = launcher.icon_cache.get(key)
+        if icon is not None:
+            # 加载失败时缓存的是空图标，同样不再重复请求
+            return icon if not icon.isNull() else None
+        if app.get('combo'):
+            # 组合图标：每个尺寸只请求一次，命中渲染缓存时立即可用，否则等后台绘制回调
+            request = (key, self._btn_size)
+            if request not in self._combo_requested:
+                self._combo_requested.add(request)
+                try:
+                    icon = launcher._request_combo_icon(key, launcher._combo_member_keys(app), self._btn_size,
+                                                        priority=len(self._apps) - row)
+                    if icon is not None and not icon.isNull():
+                        launcher.icon_cache[key] = icon
+                        return icon
+                except Exception as e:
+                    print(f"请求组合图标失败: {e}")
+            return None
+        if app.get('icon') and key not in launcher.loading_set and id(app) not in self._pending_ids:
+            self._pending_ids.add(id(app))
+            self._pending_icons.append(app)
+            if len(self._pending_icons) == 1:
+                QTimer.singleShot(0, self._flush_icon_requests)
+        return None
+
+    def _flush_icon_requests(self):
+        apps, self._pending_icons = self._pending_icons, []
+        self._pending_ids = set()
+        if apps:
+            self.launcher._load_icons(apps)
+
+    def set_order(self, apps, btn_size):
+        """更新显示顺序；顺序与尺寸未变时只刷新数据（如重命名），不重置视图。"""
+        apps = list(apps)
+        if btn_size != self._btn_size:
+            self._combo_requested = set()
+        if btn_size == self._btn_size and [id(a) for a in apps] == [id(a) for a in self._apps]:
+            self._apps = apps
+            self._index_keys()
+            if apps:
+                self.dataChanged.emit(self.index(0), self.index(len(apps)))
+            return
+        self.beginResetModel()
+        self._apps = apps
+        self._btn_size = btn_size
+        self._index_keys()
+        self.endResetModel()
+
+    def _index_keys(self):
+        self._keys = []
+        self._rows_by_key = {}
+        for row, app in enumerate(self._apps):
+            if app.get('combo'):
+                comp_keys = self.launcher._combo_member_keys(app)
+                key = 'combo:' + hashlib.sha1(','.join(comp_keys).encode('utf-8')).hexdigest()
+            else:
+                key = app.get('icon') or app.get('path') or ''
+            self._keys.append(key)
+            if key:
+                self._rows_by_key.setdefault(key, []).append(row)
+
+    def move_row(self, src, dst):
+        """拖拽中实时移动一行（同步修改 launcher._order）。"""
+        if src == dst or not (0 <= src < len(self._apps)) or not (0 <= dst < len(self._apps)):
+            return False
+        # beginMoveRows 的目标位置是“插入到该行之前”，向后移动时需要 +1
+        if not self.beginMoveRows(QModelIndex(), src, src, QModelIndex(), dst + 1 if dst > src else dst):
+            return False
+        app = self._apps.pop(src)
+        self._apps.insert(dst, app)
+        key = self._keys.pop(src)
+        self._keys.insert(dst, key)
+        self.launcher._order = list(self._apps)
+        self._rows_by_key = {}
+        for row, k in enumerate(self._keys):
+            if k:
+                self._rows_by_key.setdefault(k, []).append(row)
+        self.endMoveRows()
+        return True
+
+    def icon_changed(self, key):
+        for row in self._rows_by_key.get(key, []):
+            idx = self.index(row)
+            self.dataChanged.emit(idx, idx, [Qt.ItemDataRole.DecorationRole])
+
+
+class AppTileDelegate(QStyledItemDelegate):
+    """绘制网格中的一个格子：圆角底板、图标（或首字母占位）、省略后的名称，以及悬停/磁吸状态。"""
+
+    def __init__(self, view):
+        super().__init__(view)
+        self.view = view
+
+    def sizeHint(self, option, index):
+        return QSize(self.view.btn_size, self.view.cell_h)
+
+    def paint(self, painter, option, index):
+        view = self.view
+        app = index.data(AppListModel.AppRole)
+        # 被拖起的格子（及已吸附的目标）由视图在鼠标位置绘制，原位置留空
+        if app is not None and (app is view._drag_app or app is view._magnet_app):
+            return
+        hover = bool(option.state & QStyle.StateFlag.State_MouseOver) and view._drag_app is None
+        magnet = None
+        if app is not None and app is view._candidate_app:
+            magnet = 'candidate'
+        self.paint_tile(painter, option.rect.topLeft(), index, hover, magnet)
+        if app is not None and index.row() == view._selected_row:
+            c = FastRunColors.PRIMARY
+            tile = QRectF(option.rect.x(), option.rect.y(), view.btn_size, view.btn_size)
+            painter.save()
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            painter.setPen(QPen(QColor(c.red(), c.green(), c.blue(), 200), 3))
+            painter.setBrush(QColor(c.red(), c.green(), c.blue(), 28))
+            painter.drawRoundedRect(tile.adjusted(1, 1, -1, -1), 18, 18)
+            painter.restore()
+
+    def paint_tile(self, painter, top_left, index, hover=False, magnet=None):
+        """在 top_left 处绘制一个完整的格子；magnet 为 None / 'candidate' / 'locked'。"""
+        view = self.view
+        btn_size = view.btn_size
+        tile = QRect(top_left.x(), top_left.y(), btn_size, btn_size)
+        is_add = index.data(AppListModel.AppRole) is None
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        if is_add:
+            c = FastRunColors.PRIMARY if hover else FastRunColors.TEXT_TERTIARY
+            border = QColor(c.red(), c.green(), c.blue(), int(255 * (0.5 if hover else 0.4)))
+            pen = QPen(border, 2, Qt.PenStyle.DashLine)
+            painter.setPen(pen)
+            painter.setBrush(QColor(242, 242, 247, int(255 * (0.8 if hover else 0.5))))
+            painter.drawRoundedRect(QRectF(tile).adjusted(1, 1, -1, -1), 18, 18)
+            painter.setPen(FastRunColors.PRIMARY if hover else FastRunColors.TEXT_SECONDARY)
+            painter.setFont(QFont('SF Pro Display', 28, QFont.Weight.Light))
+            painter.drawText(tile, Qt.AlignmentFlag.AlignCenter, '+')
+        else:
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor(255, 255, 255, 255 if hover else int(255 * 0.9)))
+            painter.drawRoundedRect(QRectF(tile), 18, 18)
+            icon = index.data(Qt.ItemDataRole.DecorationRole)
+            name = index.data(Qt.ItemDataRole.DisplayRole) or ''
+            if icon is not None and not icon.isNull():
+                icon_px = int(btn_size * 0.6)
+                icon_rect = QRect(0, 0, icon_px, icon_px)
+                icon_rect.moveCenter(tile.center())
+                icon.paint(painter, icon_rect, Qt.AlignmentFlag.AlignCenter)
+            elif name:
+                # 图标未就绪时显示首字母占位
+                painter.setPen(FastRunColors.TEXT_PRIMARY)
+                painter.drawText(tile, Qt.AlignmentFlag.AlignCenter, name[0])
+            if magnet:
+                strong = magnet == 'locked'
+                pen = QPen(QColor('#5b8cff' if strong else '#8fb3ff'), 3 if strong else 2,
+                           Qt.PenStyle.SolidLine if strong else Qt.PenStyle.DashLine)
+                painter.setPen(pen)
+                painter.setBrush(Qt.BrushStyle.NoBrush)
+                painter.drawRoundedRect(QRectF(tile).adjusted(1, 1, -1, -1), 14, 14)
+        # 名称标签
+        fm = QFontMetrics(view.font())
+        label = index.data(Qt.ItemDataRole.DisplayRole) or ''
+        text_rect = QRect(top_left.x() - 4, tile.bottom() + 1, btn_size + 8, fm.height() + 2)
+        painter.setFont(view.font())
+        painter.setPen(view.palette().color(view.foregroundRole()))
+        painter.drawText(text_rect, Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignTop,
+                         fm.elidedText(label, Qt.TextElideMode.ElideRight, btn_size + 8))
+        painter.restore()
+
+
+class AppGridView(QListView):
+    """模型/视图网格引擎：整个网格是一个 QListView，格子由 AppTileDelegate 绘制，
+    不再为每个应用创建按钮、标签与样式表。点击、右键菜单、拖拽重排与磁吸组合都在视图内处理。
+    """
+
+    def __init__(self, launcher, parent=None):
+        super().__init__(parent)
+        self.launcher = launcher
+        self.btn_size = 72
+        self.cell_h = 72
+        self.setViewMode(QListView.ViewMode.IconMode)
+        self.setMovement(QListView.Movement.Static)
+        self.setResizeMode(QListView.ResizeMode.Adjust)
+        self.setUniformItemSizes(True)
+        self.setWrapping(True)
+        self.setSelectionMode(QListView.SelectionMode.NoSelection)
+        self.setVerticalScrollMode(QListView.ScrollMode.ScrollPerPixel)
+        self.setEditTriggers(QListView.EditTrigger.NoEditTriggers)
+        self.setFrameShape(QFrame.Shape.NoFrame)
+        self.setMouseTracking(True)
+        self.viewport().setAttribute(Qt.WidgetAttribute.WA_Hover, True)
+        self.setStyleSheet('QListView { background: transparent; border: none; }')
+        self.model_ = AppListModel(launcher, self)
+        self.setModel(self.model_)
+        self.delegate = AppTileDelegate(self)
+        self.setItemDelegate(self.delegate)
+        self.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.customContextMenuRequested.connect(self._on_context_menu)
+        # 拖拽状态（坐标均为 viewport 坐标）
+        self._press_pos = None
+        self._press_row = -1
+        self._drag_app = None
+        self._drag_row = -1
+        self._drag_offset = QPoint(0, 0)
+        self._drag_top_left = QPoint(0, 0)
+        # 磁吸：候选（虚线高亮，等待停留计时）与已吸附的目标（跟随拖拽物）
+        self._candidate_app = None
+        self._magnet_app = None
+        self._magnet_offset = QPoint(0, 0)
+        self._magnet_timer = QTimer(self)
+        self._magnet_timer.setSingleShot(True)
+        self._magnet_timer.timeout.connect(self._confirm_magnet)
+        # 拖拽中的鼠标移动按帧合并
+        self._drag_frames = DragFrameCoalescer(self._update_drag, self)
+        # 键盘选中的行（-1 表示没有）
+        self._selected_row = -1
+
+    def select_row(self, row):
+        """标出键盘选中的行并滚动到可见处，只重绘新旧两个格子。"""
+        old, self._selected_row = self._selected_row, row
+        for r in (old, row):
+            if r >= 0:
+                self.update(self.model_.index(r))
+        if row >= 0:
+            self.scrollTo(self.model_.index(row))
+
+    def apply_metrics(self, btn_size, cell_h, spacing, margin):
+        self.btn_size = btn_size
+        self.cell_h = cell_h
+        self.setViewportMargins(margin, margin, margin, margin)
+        self.setGridSize(QSize(btn_size + spacing, cell_h + spacing))
+
+    def set_order(self, apps):
+        self.model_.set_order(apps, self.btn_size)
+
+    def _tile_rect(self, row):
+        """该行格子中方形底板的 viewport 坐标。"""
+        r = self.visualRect(self.model_.index(row))
+        return QRect(r.x(), r.y(), self.btn_size, self.btn_size)
+
+    def _on_context_menu(self, pos):
+        idx = self.indexAt(pos)
+        app = self.model_.app_at(idx.row()) if idx.isValid() else None
+        if app is not None:
+            self.launcher.on_app_context_menu(app, self.viewport(), pos)
+
+    # --- 鼠标 ---
+    def mousePressEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton:
+            self._press_pos = event.position().toPoint()
+            idx = self.indexAt(self._press_pos)
+            self._press_row = idx.row() if idx.isValid() else -1
+        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        pos = event.position().toPoint()
+        if self._drag_app is not None:
+            self._drag_frames.push(pos)
+            return
+        if (self._press_pos is not None and self.model_.app_at(self._press_row) is not None
+                and self.launcher.drag_enabled()):
+            if (pos - self._press_pos).manhattanLength() >= QApplication.startDragDistance():
+                self._start_drag()
+                self._drag_frames.push(pos)
+                return
+        super().mouseMoveEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        pos = event.position().toPoint()
+        press_row = self._press_row
+        self._press_pos = None
+        self._press_row = -1
+        if event.button() != Qt.MouseButton.LeftButton:
+            super().mouseReleaseEvent(event)
+            return
+        if self._drag_app is not None:
+            self._drag_frames.flush()
+            self._end_drag()
+            return
+        super().mouseReleaseEvent(event)
+        idx = self.indexAt(pos)
+        # 只有按下与释放落在同一格子的方形底板内才算点击
+        if not idx.isValid() or idx.row() != press_row or not self._tile_rect(press_row).contains(pos):
+            return
+        if self.model_.is_add_row(press_row):
+            self.launcher.add_app_via_dialog()
+        else:
+            app = self.model_.app_at(press_row)
+            if app is not None:
+                self.launcher._activate_app(app)
+
+    # --- 拖拽重排与磁吸 ---
+    def _start_drag(self):
+        self._drag_frames.reset()
+        self._drag_row = self._press_row
+        self._drag_app = self.model_.app_at(self._drag_row)
+        self._drag_offset = self._press_pos - self.visualRect(self.model_.index(self._drag_row)).topLeft()
+        self._candidate_app = None
+        self._magnet_app = None
+        self._magnet_timer.stop()
+
+    def _update_drag(self, pos):
+        self._drag_top_left = pos - self._drag_offset
+        self.viewport().update()
+        # 已吸附：目标跟随拖拽物移动，不再重排
+        if self._magnet_app is not None:
+            return
+        drag_rect = QRect(self._drag_top_left, QSize(self.btn_size, self.cell_h))
+        # 与 widgets 引擎相同的判定：左右边缘接近且垂直方向有重叠
+        nearest = None
+        threshold = self.launcher._magnet_threshold
+        for row in self._visible_rows():
+            app = self.model_.app_at(row)
+            if app is None or app is self._drag_app:
+                continue
+            r = self.visualRect(self.model_.index(row))
+            overlap_y = not (drag_rect.bottom() < r.top() or r.bottom() < drag_rect.top())
+            dx = min(abs(drag_rect.right() - r.left()), abs(r.right() - drag_rect.left()))
+            if overlap_y and dx <= threshold:
+                nearest = app
+                break
+        if nearest is not self._candidate_app:
+            self._candidate_app = nearest
+            if nearest is None:
+                self._magnet_timer.stop()
+            else:
+                self._magnet_timer.start(self.launcher._magnet_delay_ms)
+
+        # 拖拽物中心所在的格子即目标位置，实时移动该行
+        idx = self.indexAt(drag_rect.center())
+        target = idx.row() if idx.isValid() else -1
+        if self.model_.app_at(target) is not None and target != self._drag_row:
+            if self.model_.move_row(self._drag_row, target):
+                self._drag_row = target
+
+    def _visible_rows(self):
+        n = self.model_.rowCount()
+        if n == 0:
+            return range(0)
+        first = self.indexAt(QPoint(1, 1))
+        lo = first.row() if first.isValid() else 0
+        last = self.indexAt(QPoint(self.viewport().width() - 1, self.viewport().height() - 1))
+        hi = last.row() + 1 if last.isValid() else n
+        # indexAt 落在格子间隙时返回无效索引，放宽一行
+        cols = max(1, self.viewport().width() // max(1, self.gridSize().width()))
+        return range(max(0, lo - cols), min(n, hi + cols))
+
+    def _confirm_magnet(self):
+        app = self._candidate_app
+        if self._drag_app is None or app is None:
+            return
+        row = self.model_._apps.index(app) if app in self.model_._apps else -1
+        if row < 0:
+            return
+        self._magnet_app = app
+        self._candidate_app = None
+        # 吸附到拖拽物左侧或右侧
+        r = self.visualRect(self.model_.index(row))
+        left = r.center().x() < self._drag_top_left.x() + self.btn_size // 2
+        self._magnet_offset = QPoint(-self.btn_size if left else self.btn_size, 0)
+        self.viewport().update()
+
+    def _end_drag(self):
+        launcher = self.launcher
+        launcher.last_drag_stats = self._drag_frames.stats()
+        app = self._drag_app
+        target = self._magnet_app
+        row = self._drag_row
+        self._drag_app = None
+        self._drag_row = -1
+        self._candidate_app = None
+        self._magnet_app = None
+        self._magnet_timer.stop()
+        self.viewport().update()
+        try:
+            if target is not None:
+                launcher._merge_into_combo(app, target, row)
+                launcher.rebuild_app_grid(launcher.search.text() if hasattr(launcher, 'search') else '')
+            else:
+                launcher._commit_display_order(launcher._order)
+                launcher.save_config()
+        except Exception as e:
+            print(f"End drag error: {e}")
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self.model_.rowCount() == 0:
+            painter = QPainter(self.viewport())
+            painter.setPen(self.palette().color(self.foregroundRole()))
+            painter.drawText(QRect(0, 0, self.viewport().width(), self.cell_h), Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop,
+                             '未找到匹配的应用。')
+            painter.end()
+            return
+        if self._drag_app is None:
+            return
+        painter = QPainter(self.viewport())
+        locked = self._magnet_app is not None
+        if locked:
+            row = self.model_._apps.index(self._magnet_app)
+            self.delegate.paint_tile(painter, self._drag_top_left + self._magnet_offset, self.model_.index(row),
+                                     magnet='locked')
+        # 候选目标的虚线由 delegate 在原位绘制，拖拽物同样加虚线
+        self.delegate.paint_tile(painter, self._drag_top_left, self.model_.index(self._drag_row), hover=True,
+                                 magnet='locked' if locked else ('candidate' if self._candidate_app is not None else None))
+        painter.end()
+
+
+class CellAnimator(QObject):
+    """网格单元的位置动画控制器：每个单元最多一个 pos 动画，新的终点直接改写正在运行的动画。
+
+    一次重排中需要移动的单元作为一个 QParallelAnimationGroup 启动（一个 wave）；
+    改写终点时动画从单元当前位置重新开始，不会在同一单元上叠加多个动画。动画结束后立即释放。
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # 单元 -> 正在运行的 QPropertyAnimation
+        self._anims = {}
+
+    def target(self, cell):
+        """单元正在移向的位置；没有运行中的动画时返回 None。"""
+        anim = self._anims.get(cell)
+        return anim.endValue() if anim is not None else None
+
+    def stop(self, cell):
+        anim = self._anims.pop(cell, None)
+        if anim is not None:
+            self._detach(anim)
+            anim.stop()
+            anim.deleteLater()
+
+    def stop_all(self):
+        for cell in list(self._anims):
+            self.stop(cell)
+
+    def running(self):
+        """是否有单元正在移动。"""
+        return bool(self._anims)
+
+    def _detach(self, anim):
+        group = anim.group()
+        if group is not None:
+            group.removeAnimation(anim)
+            if group.animationCount() == 0:
+                group.stop()
+                group.deleteLater()
+
+    def _retarget(self, cell, pos, duration, curve):
+        """取得单元的动画并改为从当前位置移向 pos；已在移向 pos 时返回 None。"""
+        anim = self._anims.get(cell)
+        if anim is not None:
+            if anim.endValue() == pos:
+                return None
+            anim.stop()
+            self._detach(anim)
+        elif cell.pos() == pos:
+            return None
+        else:
+            anim = QPropertyAnimation(cell, b'pos', self)
+            anim.finished.connect(lambda c=cell, a=anim: self._release(c, a))
+            self._anims[cell] = anim
+        anim.setDuration(duration)
+        anim.setEasingCurve(curve)
+        anim.setStartValue(cell.pos())
+        anim.setEndValue(pos)
+        return anim
+
+    def move(self, cell, pos, duration=FastRunTiming.FAST, curve=QEasingCurve.Type.OutCubic):
+        anim = self._retarget(cell, pos, duration, curve)
+        if anim is not None:
+            anim.start()
+
+    def wave(self, moves, duration=FastRunTiming.NORMAL, curve=QEasingCurve.Type.OutCubic):
+        """把 [(单元, 目标位置), ...] 作为一组动画同时启动。"""
+        group = None
+        for cell, pos in moves:
+            anim = self._retarget(cell, pos, duration, curve)
+            if anim is None:
+                continue
+            if group is None:
+                group = QParallelAnimationGroup(self)
+                group.finished.connect(group.deleteLater)
+            group.addAnimation(anim)
+        if group is not None:
+            group.start()
+
+    def _release(self, cell, anim):
+        if self._anims.get(cell) is anim:
+            del self._anims[cell]
+        # 组内的动画随组一起删除
+        if anim.group() is None:
+            anim.deleteLater()
+
+
+class DragFrameCoalescer(QObject):
+    """把拖拽中的鼠标移动合并到显示帧：只记录最新的指针位置，每帧最多调用一次 handler。
+
+    高回报率鼠标每秒会产生 500~1000 次移动事件，而重排、磁吸检测与动画只需要按屏幕刷新率执行。
+    received / processed 记录本次拖拽收到的事件数与实际处理的次数，二者之差即被合并的事件数。
+    """
+
+    def __init__(self, handler, parent=None):
+        super().__init__(parent)
+        self.handler = handler
+        self._pending = None
+        self.received = 0
+        self.processed = 0
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self.flush)
+
+    @staticmethod
+    def frame_interval_ms():
+        try:
+            rate = QApplication.primaryScreen().refreshRate()
+        except Exception:
+            rate = 0
+        return max(1, int(1000 / rate)) if rate and rate > 0 else 16
+
+    def reset(self):
+        """开始新的一次拖拽：清空计数与尚未处理的位置。"""
+        self._timer.stop()
+        self._pending = None
+        self.received = 0
+        self.processed = 0
+
+    def push(self, *args):
+        """记录最新的一次移动；本帧尚未安排处理时启动帧计时器。"""
+        self.received += 1
+        self._pending = args
+        if not self._timer.isActive():
+            self._timer.start(self.frame_interval_ms())
+
+    def flush(self):
+        """立即处理尚未处理的最新位置（帧计时器到期或拖拽结束时调用）。"""
+        self._timer.stop()
+        args, self._pending = self._pending, None
+        if args is None:
+            return
+        self.processed += 1
+        self.handler(*args)
+
+    def stats(self):
+        return {'received': self.received, 'processed': self.processed,
+                'coalesced': self.received - self.processed}
+
+
+class MagnetHighlightOverlay(QWidget):
+    """覆盖在网格内容区上的透明层，绘制磁吸预览（虚线）与锁定（实线）高亮，以及键盘选中的格子。
+
+    高亮以前通过给单元设置样式表实现，每次变化都会让 Qt 重新计算该单元整棵子树的样式；
+    现在只需重绘高亮所在的矩形。该层不接收鼠标事件，尺寸随父控件变化。
+    """
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, True)
+        self._cells = ()
+        self._strong = False
+        # 键盘选中格子的方形底板矩形（内容区坐标），没有选中时为空
+        self._selection = QRect()
+        # 上一次绘制高亮的区域，变化时与新区域一起重绘
+        self._painted = QRect()
+        self.setGeometry(parent.rect())
+        parent.installEventFilter(self)
+        self.show()
+
+    def eventFilter(self, source, event):
+        if source is self.parentWidget() and event.type() == QEvent.Type.Resize:
+            self.setGeometry(source.rect())
+        return False
+
+    def _tile_rects(self):
+        # 高亮画在单元的方形按钮上（不含名称标签）
+        return [c.btn.geometry().translated(c.pos()) for c in self._cells]
+
+    def show_for(self, cells, strong=False):
+        """高亮 cells；strong 为 True 表示已锁定吸附。"""
+        cells = tuple(c for c in cells if c is not None)
+        if cells == self._cells and strong == self._strong:
+            return
+        self._cells = cells
+        self._strong = strong
+        # 被拖拽的单元会被置顶，保持本层在最上面
+        siblings = self.parentWidget().children()
+        if siblings and siblings[-1] is not self:
+            self.raise_()
+        self.track()
+
+    def clear(self):
+        if self._cells:
+            self._cells = ()
+            self.track()
+
+    def show_selection(self, rect):
+        """标出键盘选中的格子；rect 为空矩形时取消。"""
+        rect = QRect(rect)
+        if rect == self._selection:
+            return
+        self._selection = rect
+        if not rect.isEmpty():
+            siblings = self.parentWidget().children()
+            if siblings and siblings[-1] is not self:
+                self.raise_()
+        self.track()
+
+    def track(self):
+        """高亮的单元移动后调用：只重绘旧位置与新位置。"""
+        area = QRect()
+        if not self._selection.isEmpty():
+            area = self._selection.adjusted(-3, -3, 3, 3)
+        for r in self._tile_rects():
+            area = area.united(r.adjusted(-3, -3, 3, 3))
+        dirty = area.united(self._painted)
+        self._painted = area
+        if not dirty.isEmpty():
+            self.update(dirty)
+
+    def paintEvent(self, event):
+        if not self._cells and self._selection.isEmpty():
+            return
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        if not self._selection.isEmpty():
+            c = FastRunColors.PRIMARY
+            painter.setPen(QPen(QColor(c.red(), c.green(), c.blue(), 200), 3))
+            painter.setBrush(QColor(c.red(), c.green(), c.blue(), 28))
+            painter.drawRoundedRect(QRectF(self._selection).adjusted(1, 1, -1, -1), 18, 18)
+        strong = self._strong
+        pen = QPen(QColor('#5b8cff' if strong else '#8fb3ff'), 3 if strong else 2,
+                   Qt.PenStyle.SolidLine if strong else Qt.PenStyle.DashLine)
+        painter.setPen(pen)
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        for r in self._tile_rects():
+            painter.drawRoundedRect(QRectF(r).adjusted(1, 1, -1, -1), 14, 14)
+        painter.end()
+
+
+class TileGridIndex:
+    """格子的均匀网格桶索引：桶的大小为一个槽位间距（grid_positions 的行列间距）。
+
+    拖拽时只需检查 rect 外扩 reach 像素后覆盖的桶中的格子，而不是遍历全部单元。
+    格子按其当前矩形的左上角入桶（静止时即所在槽位）；查询时再向左上多取一个格子的宽高，
+    覆盖左上角落在范围外、主体伸进范围内的格子。
+    """
+
+    def __init__(self, origin_x, origin_y, pitch_w, pitch_h):
+        self.origin_x = origin_x
+        self.origin_y = origin_y
+        self.pitch_w = max(1, pitch_w)
+        self.pitch_h = max(1, pitch_h)
+        # (行, 列) -> [(显示序号, item), ...]
+        self._buckets = {}
+        self._max_w = 0
+        self._max_h = 0
+
+    def rebuild(self, items):
+        """items 为 (显示序号, 当前矩形, item) 的可迭代对象。"""
+        buckets = {}
+        max_w = max_h = 0
+        for idx, rect, item in items:
+            key = ((rect.top() - self.origin_y) // self.pitch_h, (rect.left() - self.origin_x) // self.pitch_w)
+            buckets.setdefault(key, []).append((idx, item))
+            max_w = max(max_w, rect.width())
+            max_h = max(max_h, rect.height())
+        self._buckets = buckets
+        self._max_w = max_w
+        self._max_h = max_h
+
+    def near(self, rect, reach=0):
+        """按显示顺序返回矩形可能落在 rect 外扩 reach 像素范围内的 item。
+
+        外扩的桶数为 ceil(reach / 间距)，阈值大于一个间距（小按钮、大阈值）时同样不会漏掉。
+        """
+        c0 = (rect.left() - reach - self._max_w - self.origin_x) // self.pitch_w
+        c1 = (rect.right() + reach - self.origin_x) // self.pitch_w
+        r0 = (rect.top() - reach - self._max_h - self.origin_y) // self.pitch_h
+        r1 = (rect.bottom() + reach - self.origin_y) // self.pitch_h
+        found = []
+        for r in range(r0, r1 + 1):
+            for c in range(c0, c1 + 1):
+                found.extend(self._buckets.get((r, c), ()))
+        found.sort(key=lambda e: e[0])
+        return [item for _, item in found]
+
+
+class LauncherWindow(QWidget):
+    """自定义圆角启动器窗口，居中显示，右上角有最小化/最大化/关闭按钮。"""
+
+    # 可显示的应用超过该数量时改用虚拟化网格（settings.json 的 grid_virtualize 可强制开启/关闭）
+    VIRTUAL_GRID_THRESHOLD = 300
+    # 虚拟化网格在视口上下额外创建的行数
+    VIRTUAL_OVERSCAN_ROWS = 2
+    # 虚拟化网格保留的空闲单元数量（滚动回来时直接复用）
+    VIRTUAL_SPARE_CELLS = 64
+    # 窗口尺寸变化后重新排列网格的最短间隔（毫秒，约一帧）
+    RELAYOUT_INTERVAL_MS = 16
+    # 搜索输入合并的间隔（毫秒，约一帧）
+    SEARCH_DEBOUNCE_MS = 16
+
+    def __init__(self, apps, launcher_callback=None, icon_cache=None):
+        super().__init__(None)
+        self.apps = apps or []
+        self.launcher_callback = launcher_callback
+        # 常驻模式：关闭只隐藏窗口，图标任务继续完成以保持缓存温热（由 FloatingBall 设置）
+        self.persistent = False
+        # 最近一次写入或同步 apps.json 时的修改时间，用于发现外部修改
+        self.apps_mtime = None
+        self._maximized = False
+        self._prev_geometry = None
+        # 可配置的图标按钮尺寸（像素），修改此值可改变网格中图标大小
+        self.btn_size = 112
+        # icon cache: path -> QIcon（可由调用方传入，在多个窗口之间共享）
+        self.icon_cache = icon_cache if icon_cache is not None else {}
+        # 组合图标后台绘制任务：任务键 -> (combo_key, 尺寸, 像素比)
+        self._combo_jobs = {}
+        # 搜索索引；self.apps 变化（保存、同步、顺序写回）时标记为过期，下次搜索前增量同步；原地改名用 touch() 标记
+        self._search_index = AppSearchIndex(rank_key=launch_key)
+        # 启动记录：用于 frecency 排序与搜索结果排序
+        self._launch_history = get_launch_history()
+        # 未搜索时的排序：'manual'（self.apps 顺序，可拖拽调整）或 'frecency'（常用的排在前面）
+        self.grid_sort = 'manual'
+        self._resort_pending = False
+        # 显示启动器时焦点直接放在搜索框（输入即搜索，回车启动第一个结果）
+        self.focus_search_on_open = True
+        # 键盘选中的应用在 self._order 中的下标（-1 表示没有）
+        self._selected = -1
+        # 空闲时分批预先计算检索词，避免第一次搜索时集中做拼音转换
+        self._search_warm_iter = iter(list(self.apps))
+        QTimer.singleShot(0, self._warm_search_index)
+        # 网格单元按应用身份复用：id(app) -> AppCell
+        self._cell_by_app = {}
+        # 当前可显示应用的显示顺序（与 grid_positions 一一对应）
+        self._order = []
+        self._grid_cols = 1
+        self._grid_cell_h = self.btn_size
+        # 'auto' / True / False
+        self.grid_virtualize = 'auto'
+        self._virtual = False
+        # 网格渲染引擎：'widgets'（每个应用一个 AppCell）或 'view'（AppGridView 统一绘制）
+        self.grid_engine = 'widgets'
+        self._grid_view = None
+        # 尺寸变化导致列数改变时，单元是否以动画移动到新位置
+        self.grid_relayout_animate = False
+        self._add_cell = None
+        self._empty_label = None
+        # path -> list of QPushButton instances to update
+        self.path_buttons = {}
+        # 单元被 _sync_cells 之外的地方销毁后置为 True，下次同步时重建 path_buttons
+        self._path_buttons_stale = False
+        # set of paths currently loading
+        self.loading_set = set()
+        # 图标加载任务统一交给共享线程池（见 IconLoadPool）
+        self._icon_pool = get_icon_load_pool()
+        # 设置存储路径
+        self.settings_path = os.path.join(os.path.dirname(__file__), 'settings.json')
+        # 先加载配置以便初始化 UI 使用
+        self.load_settings()
+        self.init_ui()
+
+    def init_ui(self):
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.WindowStaysOnTopHint)
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
         # 初始尺寸与最小/最大限制（放大启动器窗口）
@@ -1207,6 +3669,12 @@ class LauncherWindow(QWidget):
             }}
         """)
         self.search.textChanged.connect(self.on_search_text_changed)
+        # 方向键移动选中、回车启动、Esc 清空/关闭（见 _on_search_key）
+        self.search.installEventFilter(self)
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(self.SEARCH_DEBOUNCE_MS)
+        self._search_timer.timeout.connect(self._apply_search)
         frame_layout.addWidget(self.search)
 
         # 内容区：放入 QScrollArea 以便当应用过多时出现滚动条
@@ -1221,10 +3689,14 @@ class LauncherWindow(QWidget):
         self.grid_margin = 12
         scroll.setWidget(content_widget)
         frame_layout.addWidget(scroll)
+        # 磁吸高亮绘制在内容区上方的透明层中
+        self._magnet_overlay = MagnetHighlightOverlay(content_widget)
 
         # 保存引用以便重建
         self._content_widget = content_widget
         self._scroll = scroll
+        # 虚拟化网格滚动时回收/绑定单元
+        scroll.verticalScrollBar().valueChanged.connect(self._on_grid_scrolled)
         self._drag_pos = None
         # cells 对应当前 self.apps 的可视单元（顺序即显示顺序）
         self.cells = []
@@ -1241,11 +3713,23 @@ class LauncherWindow(QWidget):
         self._magnet_delay_ms = 320  # 停留时间阈值（毫秒）加快确认
         self._magnet_candidate = None
         self._magnet_candidate_snap = None
+        # 拖拽中的鼠标移动按帧合并，最近一次拖拽的事件计数见 last_drag_stats
+        self._drag_frames = DragFrameCoalescer(self.update_drag, self)
+        self.last_drag_stats = None
+        # 磁吸候选查找用的空间索引，单元或显示顺序变化后置空，下次查找时重建
+        self._tile_index = None
         self._magnet_timer = QTimer(self)
         self._magnet_timer.setSingleShot(True)
         self._magnet_timer.timeout.connect(self._confirm_magnet_candidate)
-        # 动画引用池，防止被回收
+        # 动画引用池，防止被回收（结束后由 _keep_animation 移除）
         self._anims = []
+        # 单元位置动画（重排 wave、归位、重新排列）统一交给控制器，每个单元只有一个可改写终点的动画
+        self._cell_anims = CellAnimator(self)
+        # 尺寸变化时的重新排列按帧合并（约 60fps）
+        self._relayout_timer = QTimer(self)
+        self._relayout_timer.setSingleShot(True)
+        self._relayout_timer.setInterval(self.RELAYOUT_INTERVAL_MS)
+        self._relayout_timer.timeout.connect(self._relayout_grid)
         # 支持窗口级拖拽添加
         self.setAcceptDrops(True)
 
@@ -1259,11 +3743,6 @@ class LauncherWindow(QWidget):
         default_h = min(int(screen_geom.height() * 0.7), 640)
         self.resize(default_w, default_h)
 
-    def resizeEvent(self, event):
-        # 保证 main_frame 和子容器随窗口大小更新
-        self.main_frame.setGeometry(0, 0, self.width(), self.height())
-        return super().resizeEvent(event)
-
     def toggle_maximize(self):
         screen_geom = QApplication.primaryScreen().availableGeometry()
         if not self._maximized:
@@ -1275,7 +3754,13 @@ class LauncherWindow(QWidget):
                 self.setGeometry(self._prev_geometry)
             self._maximized = False
 
+    def _record_launch(self, key):
+        self._launch_history.record(key)
+        # frecency 排序下顺序可能变化，下次显示前重新排列
+        self._resort_pending = self.grid_sort == 'frecency'
+
     def _on_launch(self, path):
+        self._record_launch(path)
         try:
             if self.launcher_callback:
                 self.launcher_callback(path)
@@ -1286,28 +3771,6 @@ class LauncherWindow(QWidget):
         # 启动后关闭启动器窗口
         self.close()
 
-    def _apply_magnet_style(self, widget, enable, strong=False):
-        """为磁吸预览/锁定添加视觉效果。"""
-        try:
-            if not widget:
-                return
-            if enable:
-                color = '#5b8cff' if strong else '#8fb3ff'
-                width = 3 if strong else 2
-                widget.setStyleSheet(f'QWidget{{border:{width}px {"solid" if strong else "dashed"} {color}; border-radius:14px;}}')
-            else:
-                widget.setStyleSheet('')
-        except Exception:
-            pass
-
-    def _clear_magnet_style_on_all(self):
-        """清除当前所有单元上的磁吸高亮。"""
-        try:
-            for c in self.cells:
-                self._apply_magnet_style(c, False)
-        except Exception:
-            pass
-
     def _pulse_widget(self, widget, factor=1.08, duration=150):
         """小幅脉冲动画，模拟吸附的“弹”一下。"""
         try:
@@ -1337,139 +3800,123 @@ class LauncherWindow(QWidget):
             group.addAnimation(anim_up)
             group.addAnimation(anim_down)
             group.start()
-            self._anims.append(group)
+            self._keep_animation(group)
         except Exception:
             pass
 
-    def rebuild_app_grid(self, filter_text=''):
-        """根据 self.apps 和 filter_text 重新生成图标网格（多列）。
-
-        使用绝对定位与自定义网格位置，生成 self.cells 列表与 grid_positions。
-        """
-        # 清理之前的 path_buttons，避免旧的按钮引用残留
-        self.path_buttons = {}
-        btn_size = getattr(self, 'btn_size', 72)
-
-        # 清除内容区所有子控件
-        for ch in list(self._content_widget.children()):
-            if isinstance(ch, QWidget):
-                ch.setParent(None)
-                ch.deleteLater()
-
-        self.cells = []
-        self.grid_positions = []
-
-        apps = self.apps
-        if filter_text:
-            ft = filter_text.lower()
-            apps = [a for a in apps if ft in (a.get('name','').lower())]
+    @staticmethod
+    def _combo_member_keys(app):
+        """组合成员用于绘制的 key 列表（成员的 icon 或 path）。"""
+        keys = []
+        for member in app.get('combo', []):
+            # member 可能是 dict (保存 name/path/icon)
+            if isinstance(member, dict):
+                keys.append(member.get('icon') or member.get('path') or '')
+            else:
+                keys.append(str(member))
+        return keys
+
+    def _cell_signature(self, app, btn_size):
+        """决定单元外观的内容；与已有单元的签名不同（如重命名、改图标、改尺寸）时重建该单元。"""
+        combo = tuple(self._combo_member_keys(app)) if app.get('combo') else None
+        return (btn_size, app.get('name', ''), app.get('path'), app.get('icon'), combo)
+
+    def _create_app_cell(self):
+        """创建一个空白单元并连接点击、右键菜单；回调在触发时读取单元当前绑定的 app。"""
+        cell = AppCell({}, self, getattr(self, 'btn_size', 72), parent=self._content_widget)
+        cell._sig = None
+        # 注册到 path_buttons 时使用的 key，供 IconLoader 回调更新
+        cell.icon_reg_key = None
+        cell.btn.clicked.connect(lambda _checked=False, c=cell: self._on_cell_clicked(c))
+        # context menu on inner button
+        try:
+            cell.btn.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+            cell.btn.customContextMenuRequested.connect(lambda pos, c=cell: self.on_app_context_menu(c.app, c.btn, pos))
+        except Exception:
+            pass
+        return cell
 
-        if not apps:
-            lbl = QLabel('未找到匹配的应用。', self._content_widget)
-            lbl.move(self.grid_margin, self.grid_margin)
-            lbl.show()
-            return
+    def _on_cell_clicked(self, cell):
+        self._activate_app(cell.app)
 
-        # 计算列数（基于可见宽度）
+    def _activate_app(self, app):
+        if app.get('combo'):
+            # 组合图标：点击启动组合内所有应用
+            self._on_launch_combo(app)
+        elif app.get('path'):
+            self._on_launch(app.get('path'))
+
+    def _bind_cell(self, cell, app, btn_size, cell_h, sig, priority=0):
+        """把单元绑定到 app，设置 tooltip 与初始图标（从缓存取或显示首字母占位）。"""
+        cell.bind(app, btn_size)
+        cell._sig = sig
+        cell.icon_reg_key = None
+        cell.btn.setEnabled(bool(app.get('combo') or app.get('path')))
         try:
-            avail_w = max(200, self._scroll.viewport().width())
+            display_name = app.get('name', '') or ''
+            cell.btn.setToolTip(display_name)
+            cell.btn.setIcon(QIcon())
+            cell.btn.setText(display_name[0] if display_name else '')
+            # 选择用于图标加载的 key（优先 app['icon']，回退到 path）
+            icon_key = app.get('icon') or app.get('path') or ''
+            icon = None
+            if icon_key:
+                # 对于组合图标，我们生成图标并缓存到 special key
+                if app.get('combo'):
+                    # icon_keys 为组合成员的 icon 或 path
+                    comp_keys = self._combo_member_keys(app)
+                    combo_key = 'combo:' + hashlib.sha1(','.join(comp_keys).encode('utf-8')).hexdigest()
+                    # register under combo_key so future updates may address it
+                    cell.icon_reg_key = combo_key
+                    # 渲染缓存命中（成员图标未变化）直接使用；否则先显示占位，由工作线程绘制后替换
+                    try:
+                        icon = self._request_combo_icon(combo_key, comp_keys, btn_size, priority=priority)
+                        if icon is not None and not icon.isNull():
+                            self.icon_cache[combo_key] = icon
+                    except Exception:
+                        icon = None
+                else:
+                    cell.icon_reg_key = icon_key
+                    icon = self.icon_cache.get(icon_key)
+            if icon is not None and not icon.isNull():
+                cell.btn.setIcon(icon)
+                cell.btn.setIconSize(QSize(int(btn_size*0.6), int(btn_size*0.6)))
+                cell.btn.setText('')
         except Exception:
-            avail_w = max(200, self.width())
-        spacing = getattr(self, 'grid_spacing', 16)
-        margin = getattr(self, 'grid_margin', 12)
-        cols = max(1, avail_w // (btn_size + spacing))
+            pass
 
-        n = len(apps)
-        rows = math.ceil(max(1, n + 1) / cols)  # 预留“添加”按钮一格
+        cell.setFixedSize(btn_size, cell_h)
 
-        # 预计算每个格子的位置
-        cell_h = btn_size + (QFontMetrics(QLabel().font()).height() + 2)
-        positions = []
-        for idx in range(n):
-            r = idx // cols
-            c = idx % cols
-            x = margin + c * (btn_size + spacing)
-            y = margin + r * (cell_h + spacing)
-            positions.append(QPoint(x, y))
+    def _keep_animation(self, anim):
+        """持有动画引用直到它结束，结束后立即释放。"""
+        self._anims.append(anim)
 
-        # 更新内容 widget 最小高度以支持滚动
-        total_h = margin + rows * (cell_h + spacing)
-        self._content_widget.setMinimumHeight(total_h + margin)
+        def release():
+            if anim in self._anims:
+                self._anims.remove(anim)
+            anim.deleteLater()
 
-        # 创建单元并绝对定位
-        for idx, app in enumerate(apps):
-            pos = positions[idx]
-            cell = AppCell(app, self, btn_size, parent=self._content_widget)
-            # connect launch/click behavior on inner button
-            if app.get('combo'):
-                # 组合图标：点击启动组合内所有应用
-                cell.btn.clicked.connect(partial(self._on_launch_combo, app))
-            elif app.get('path'):
-                cell.btn.clicked.connect(partial(self._on_launch, app.get('path')))
-            else:
-                cell.btn.setEnabled(False)
-            # context menu on inner button
-            try:
-                cell.btn.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
-                cell.btn.customContextMenuRequested.connect(lambda pos, a=app, b=cell.btn: self.on_app_context_menu(a, b, pos))
-            except Exception:
-                pass
+        anim.finished.connect(release)
 
-            # 注册 tooltip 与初始图标显示（从缓存取或显示首字母占位）
-            try:
-                display_name = app.get('name', '') or ''
-                cell.btn.setToolTip(display_name)
-                # 选择用于图标加载的 key（优先 app['icon']，回退到 path）
-                icon_key = app.get('icon') or app.get('path') or ''
-                if icon_key in self.icon_cache:
-                    icon = self.icon_cache.get(icon_key)
-                    if not icon.isNull():
-                        cell.btn.setIcon(icon)
-                        cell.btn.setIconSize(QSize(int(cell.btn.width()*0.6), int(cell.btn.height()*0.6)))
-                        cell.btn.setText('')
-                    else:
-                        # 使用首字母作为文本占位
-                        if display_name:
-                            cell.btn.setText(display_name[0])
-                else:
-                    if display_name:
-                        cell.btn.setText(display_name[0])
-                # 把按钮注册到 path_buttons 映射，供 IconLoader 回调更新
-                if icon_key:
-                    # 对于组合图标，我们生成图标并缓存到 special key
-                    if app.get('combo'):
-                        # icon_keys 为组合成员的 icon 或 path
-                        comp_keys = []
-                        for member in app.get('combo', []):
-                            # member 可能是 dict (保存 name/path/icon)
-                            if isinstance(member, dict):
-                                comp_keys.append(member.get('icon') or member.get('path') or '')
-                            else:
-                                comp_keys.append(str(member))
-                        combo_key = 'combo:' + hashlib.sha1(','.join(comp_keys).encode('utf-8')).hexdigest()
-                        # 立刻生成图标并缓存
-                        try:
-                            icon = generate_combo_icon(comp_keys, size=btn_size)
-                            if not icon.isNull():
-                                self.icon_cache[combo_key] = icon
-                                cell.btn.setIcon(icon)
-                                cell.btn.setIconSize(QSize(int(cell.btn.width()*0.6), int(cell.btn.height()*0.6)))
-                                cell.btn.setText('')
-                                # register under combo_key so future updates may address it
-                                self.path_buttons.setdefault(combo_key, []).append(cell.btn)
-                        except Exception:
-                            pass
-                    else:
-                        self.path_buttons.setdefault(icon_key, []).append(cell.btn)
-            except Exception:
-                pass
+    def _destroy_cell(self, cell):
+        self._cell_anims.stop(cell)
+        if isinstance(cell, AppCell):
+            # 先撤下事件过滤器，按钮在销毁过程中派发的事件不再回到单元
+            cell.btn.removeEventFilter(cell)
+        cell.setParent(None)
+        cell.deleteLater()
 
-            cell.setFixedSize(btn_size, cell_h)
-            cell.move(pos)
-            cell.show()
-            self.cells.append(cell)
-            self.grid_positions.append(pos)
+    def _move_cell(self, cell, pos):
+        """把复用的单元放到新位置；先停止仍在把它移向旧位置的动画。"""
+        if cell.pos() == pos:
+            return
+        if self._cell_anims.target(cell) == pos:
+            # 已经在动画归位途中
+            return
+        self._cell_anims.stop(cell)
+        cell.move(pos)
 
+    def _build_add_cell(self, btn_size, cell_h):
         # 添加“添加应用”按钮作为最后一个单元
         add_btn = QPushButton(self._content_widget)
         add_btn.setFixedSize(btn_size, btn_size)
@@ -1504,24 +3951,395 @@ class LauncherWindow(QWidget):
         lbl.setAlignment(Qt.AlignmentFlag.AlignHCenter)
         lbl.setFixedHeight(fm.height() + 2)
         layout_inner.addWidget(lbl)
-        add_idx = n  # 紧跟应用后
-        add_r = add_idx // cols
-        add_c = add_idx % cols
-        add_pos = QPoint(margin + add_c * (btn_size + spacing),
-                         margin + add_r * (cell_h + spacing))
         add_cell.setFixedSize(btn_size, cell_h)
-        add_cell.move(add_pos)
-        add_cell.show()
-        # not part of reorderable cells
-        # 注册 icon 加载同样逻辑（使用 app['icon'] if present）
+        add_cell._btn_size = btn_size
+        return add_cell
+
+    def rebuild_app_grid(self, filter_text=''):
+        """根据 self.apps 和 filter_text 刷新图标网格（多列）。
+
+        增量更新：按应用身份（self.apps 中的 dict 对象）复用已有的 AppCell，只为新应用创建单元、
+        为外观变化的应用重新绑定，销毁已不在 self.apps 中的单元，被搜索过滤的单元仅隐藏，
+        其余单元只在位置变化时移动。应用数量超过 VIRTUAL_GRID_THRESHOLD 时进入虚拟化模式，
+        只为视口附近的行创建单元，滚动时回收复用。
+
+        生成 self._order（全部可显示应用的显示顺序）、grid_positions（与 _order 一一对应）
+        与 self.cells（已创建的单元，按显示顺序）。
+        """
+        btn_size = getattr(self, 'btn_size', 72)
+
+        apps = self._sorted_apps()
+        if filter_text:
+            apps = self._search_apps(filter_text)
+
+        spacing = getattr(self, 'grid_spacing', 16)
+        margin = getattr(self, 'grid_margin', 12)
+        n = len(apps)
+        cols, cell_h, positions = self._grid_layout(n)
+        # 键盘选中跟随应用本身（重建后它的显示位置可能变化或被过滤掉）
+        selected = self._order[self._selected] if 0 <= self._selected < len(self._order) else None
+
+        if getattr(self, 'grid_engine', 'widgets') == 'view':
+            self._rebuild_grid_view(apps, btn_size, cell_h, spacing, margin, selected)
+            return
+        if self._grid_view is not None:
+            self._grid_view.hide()
+            self._scroll.show()
+
+        self._order = list(apps)
+        self._selected = self._display_index(selected) if selected is not None else -1
+        self.grid_positions = positions[:n]
+        self._grid_cols = cols
+        self._grid_cell_h = cell_h
+        mode = getattr(self, 'grid_virtualize', 'auto')
+        self._virtual = mode is True or (mode == 'auto' and n > self.VIRTUAL_GRID_THRESHOLD)
+
+        # 销毁已不属于 self.apps 的单元（单元持有 app 引用，id 在其存活期间不会被复用）
+        live = {id(a) for a in self.apps}
+        for key in [k for k in self._cell_by_app if k not in live]:
+            self._destroy_cell(self._cell_by_app.pop(key))
+            self._path_buttons_stale = True
+
+        self._update_content_height()
+
+        self._sync_cells()
+        self._show_selection()
+
+        if not apps:
+            if self._add_cell is not None:
+                self._add_cell.hide()
+            if self._empty_label is None:
+                self._empty_label = QLabel('未找到匹配的应用。', self._content_widget)
+            self._empty_label.move(self.grid_margin, self.grid_margin)
+            self._empty_label.show()
+            return
+        if self._empty_label is not None:
+            self._empty_label.hide()
+
+        # “添加”单元紧跟应用之后，不参与重排；按钮尺寸变化时才重建
+        if self._add_cell is not None and self._add_cell._btn_size != btn_size:
+            self._destroy_cell(self._add_cell)
+            self._add_cell = None
+        if self._add_cell is None:
+            self._add_cell = self._build_add_cell(btn_size, cell_h)
+        self._add_cell.move(positions[n])
+        self._add_cell.show()
+
+    def _warm_search_index(self):
+        if self._search_warm_iter is None:
+            return
+        if self._search_index.prepare(self._search_warm_iter):
+            self._search_warm_iter = None
+        else:
+            QTimer.singleShot(0, self._warm_search_index)
+
+    def _search_apps(self, text):
+        """用搜索索引匹配 text（名称、拼音、首字母、文件名、主机名、组合成员），按相关度排序。"""
+        if self._search_index.stale:
+            self._search_index.rebuild(self.apps)
+        preferred = self._launch_history.top(AppSearchIndex.PREFERRED_LIMIT)
+        return self._search_index.search(text, preferred=preferred)
+
+    def _frecency(self, app):
+        return self._launch_history.score(launch_key(app))
+
+    def _sorted_apps(self):
+        """未搜索时的显示顺序：手动顺序，或按 frecency 排序（没有启动记录的保持手动顺序排在后面）。"""
+        if self.grid_sort != 'frecency':
+            return self.apps
+        return sorted(self.apps, key=lambda a: -self._frecency(a))
+
+    def _grid_layout(self, n):
+        """按滚动区当前可见宽度计算 n 个应用的列数、行高与格子位置（位置多出一格留给“添加”单元）。"""
+        btn_size = getattr(self, 'btn_size', 72)
+        # 计算列数（基于可见宽度）
+        try:
+            avail_w = max(200, self._scroll.viewport().width())
+        except Exception:
+            avail_w = max(200, self.width())
+        spacing = getattr(self, 'grid_spacing', 16)
+        margin = getattr(self, 'grid_margin', 12)
+        cols = max(1, avail_w // (btn_size + spacing))
+
+        # 预计算每个格子的位置
+        cell_h = btn_size + (QFontMetrics(QLabel().font()).height() + 2)
+        positions = []
+        for idx in range(n + 1):
+            r = idx // cols
+            c = idx % cols
+            x = margin + c * (btn_size + spacing)
+            y = margin + r * (cell_h + spacing)
+            positions.append(QPoint(x, y))
+        return cols, cell_h, positions
+
+    def _update_content_height(self):
+        # 更新内容 widget 最小高度以支持滚动（虚拟化模式下据此得到完整的滚动范围）
+        spacing = getattr(self, 'grid_spacing', 16)
+        margin = getattr(self, 'grid_margin', 12)
+        rows = math.ceil(max(1, len(self._order) + 1) / self._grid_cols)  # 预留“添加”按钮一格
+        total_h = margin + rows * (self._grid_cell_h + spacing)
+        self._content_widget.setMinimumHeight(total_h + margin)
+
+    def _schedule_relayout(self):
+        """合并连续的尺寸变化：每帧最多执行一次 _relayout_grid。"""
+        if not self._relayout_timer.isActive():
+            self._relayout_timer.start()
+
+    def _relayout_grid(self):
+        """窗口尺寸变化后只重新排列：按新的列数重算 grid_positions 并移动已有单元，不重新过滤或绑定。"""
+        if getattr(self, 'grid_engine', 'widgets') == 'view':
+            # QListView 自行按视口宽度换行
+            return
+        if self._add_cell is None and self._empty_label is None:
+            # 网格尚未建立（首次填充仍在排队）
+            self.rebuild_app_grid(self.search.text() if hasattr(self, 'search') else '')
+            return
+        n = len(self._order)
+        cols, cell_h, positions = self._grid_layout(n)
+        if cols == self._grid_cols and cell_h == self._grid_cell_h:
+            if self._virtual:
+                # 列数不变但视口高度可能变化，补齐新露出的行
+                self._sync_cells()
+            return
+        self.grid_positions = positions[:n]
+        self._grid_cols = cols
+        self._grid_cell_h = cell_h
+        self._tile_index = None
+        self._update_content_height()
+
+        if self._virtual:
+            # 可见区间随列数变化，交给 _sync_cells 回收/绑定并移动
+            self._sync_cells()
+        else:
+            order_index = {id(a): i for i, a in enumerate(self._order)}
+            pinned = (self._dragging_cell, self._magnet_target)
+            for cell in self.cells:
+                i = order_index.get(id(cell.app), -1)
+                if cell in pinned or not 0 <= i < n:
+                    continue
+                if self.grid_relayout_animate:
+                    self._cell_anims.move(cell, positions[i])
+                else:
+                    self._move_cell(cell, positions[i])
+        if self._add_cell is not None and n:
+            self._add_cell.move(positions[n])
+        self._show_selection()
+
+    def _rebuild_grid_view(self, apps, btn_size, cell_h, spacing, margin, selected=None):
+        """'view' 引擎：由 AppGridView 取代滚动区中的单元，布局与滚动交给 QListView。"""
+        if self._grid_view is None:
+            self._grid_view = AppGridView(self, parent=self.main_frame)
+            layout = self.main_frame.layout()
+            layout.insertWidget(layout.indexOf(self._scroll), self._grid_view)
+        # 切换引擎时释放 widgets 引擎创建的单元
+        for cell in self._cell_by_app.values():
+            self._destroy_cell(cell)
+        self._cell_by_app = {}
+        for w in (self._add_cell, self._empty_label):
+            if w is not None:
+                self._destroy_cell(w)
+        self._add_cell = None
+        self._empty_label = None
+        self.cells = []
+        self.path_buttons = {}
+        self._virtual = False
+        self._scroll.hide()
+        self._grid_view.show()
+
+        self._order = list(apps)
+        self.grid_positions = []
+        self._grid_cell_h = cell_h
+        self._grid_view.apply_metrics(btn_size, cell_h, spacing, margin)
+        self._grid_view.set_order(self._order)
+        self._selected = self._display_index(selected) if selected is not None else -1
+        self._grid_view.select_row(self._selected)
+
+    def _realized_range(self):
+        """需要创建单元的显示序号区间 [lo, hi)：普通模式为全部，虚拟化模式为视口上下各留几行余量。"""
+        n = len(self._order)
+        if not self._virtual:
+            return 0, n
+        cols = self._grid_cols
+        row_h = self._grid_cell_h + getattr(self, 'grid_spacing', 16)
+        margin = getattr(self, 'grid_margin', 12)
+        top = self._scroll.verticalScrollBar().value()
+        bottom = top + self._scroll.viewport().height()
+        first = max(0, (top - margin) // row_h - self.VIRTUAL_OVERSCAN_ROWS)
+        last = max(0, (bottom - margin) // row_h + self.VIRTUAL_OVERSCAN_ROWS)
+        return min(n, first * cols), min(n, (last + 1) * cols)
+
+    def _sync_cells(self):
+        """让已创建的单元与 _order 中需要显示的区间一致，并为新绑定的应用加载图标。"""
+        btn_size = getattr(self, 'btn_size', 72)
+        cell_h = self._grid_cell_h
+        lo, hi = self._realized_range()
+        wanted = self._order[lo:hi]
+        wanted_ids = {id(a) for a in wanted}
+        # 正在拖拽/吸附的单元不能被回收
+        pinned = {c for c in (self._dragging_cell, self._magnet_target) if c is not None}
+        spare = [c for k, c in self._cell_by_app.items() if k not in wanted_ids and c not in pinned]
+
+        # 有单元被创建、重新绑定或销毁时才需要重建 path_buttons（搜索筛选只显示/隐藏单元）
+        changed = self._path_buttons_stale
+        self.cells = []
+        for idx in range(lo, hi):
+            app = self._order[idx]
+            pos = self.grid_positions[idx]
+            sig = self._cell_signature(app, btn_size)
+            cell = self._cell_by_app.get(id(app))
+            rebind = cell is None or cell._sig != sig
+            changed = changed or rebind
+            if cell is None:
+                if self._virtual and spare:
+                    # 回收一个已滚出视口的单元
+                    cell = spare.pop()
+                    del self._cell_by_app[id(cell.app)]
+                else:
+                    cell = self._create_app_cell()
+                self._cell_by_app[id(app)] = cell
+            if rebind:
+                self._bind_cell(cell, app, btn_size, cell_h, sig, priority=hi - idx)
+            if cell not in pinned:
+                self._move_cell(cell, pos)
+            if cell.isHidden():
+                cell.show()
+            self.cells.append(cell)
+        for cell in spare:
+            if not cell.isHidden():
+                cell.hide()
+        if self._virtual and len(spare) > self.VIRTUAL_SPARE_CELLS:
+            # 回收池只保留有限数量，多余的销毁以控制内存
+            for cell in spare[self.VIRTUAL_SPARE_CELLS:]:
+                del self._cell_by_app[id(cell.app)]
+                self._destroy_cell(cell)
+                changed = True
+
+        self._tile_index = None
+
+        # 把按钮注册到 path_buttons 映射（包括被过滤隐藏的单元），供 IconLoader 回调更新
+        if changed:
+            self.path_buttons = {}
+            for cell in self._cell_by_app.values():
+                if cell.icon_reg_key:
+                    self.path_buttons.setdefault(cell.icon_reg_key, []).append(cell.btn)
+            self._path_buttons_stale = False
+
+        self._load_icons(wanted)
+
+    def _on_grid_scrolled(self, _value):
+        if self._virtual:
+            self._sync_cells()
+
+    def _load_icons(self, apps):
+        """为已创建单元的应用提交图标加载任务（已缓存或加载中的跳过）。"""
+        btn_size = getattr(self, 'btn_size', 72)
+        n = len(apps)
+        # 越靠前的格子优先级越高，先出现在可视区域的图标先加载
+        # 尚未缓存的网页图标合并为一个批量抓取任务（连接复用、同主机合并）
+        fetch_urls = []
+        # 图标在格子中约占 60%，按物理像素挑选网页图标候选
+        target_px = int(btn_size * 0.6 * self.devicePixelRatioF())
         for i, app in enumerate(apps):
+            if app.get('combo'):
+                continue
             icon_path = app.get('icon')
             if icon_path and icon_path not in self.icon_cache and icon_path not in self.loading_set:
-                loader = IconLoader(icon_path)
-                loader.icon_loaded.connect(self._on_icon_loaded)
-                self._threads.append(loader)
                 self.loading_set.add(icon_path)
-                loader.start()
+                if icon_path.lower().startswith(('http://', 'https://')) and favicon_state(icon_path)[0] in ('missing', 'stale'):
+                    fetch_urls.append(icon_path)
+                else:
+                    self._icon_pool.submit(icon_path, self._on_icon_loaded, owner=self, priority=n - i,
+                                           target_px=target_px)
+        if fetch_urls:
+            self._icon_pool.submit_batch(fetch_urls, self._on_icon_loaded, owner=self, priority=0,
+                                         target_px=target_px)
+
+    def _display_index(self, app):
+        for i, a in enumerate(self._order):
+            if a is app:
+                return i
+        return -1
+
+    def _commit_display_order(self, order):
+        """把显示顺序写回 self.apps。
+
+        搜索过滤时 order 只含部分应用：按新顺序依次填回这些应用原来占据的位置，其余应用不动；
+        order 中新出现的应用（如新建的组合）放在紧随其后的原有应用之前。
+        """
+        existing = {id(a) for a in self.apps}
+        placed = {id(a) for a in order if id(a) in existing}
+        it = iter(order)
+        result = []
+        for a in self.apps:
+            if id(a) not in placed:
+                result.append(a)
+                continue
+            for b in it:
+                result.append(b)
+                if id(b) in existing:
+                    break
+        result.extend(it)
+        self.apps = result
+        self._search_index.stale = True
+
+    def closeEvent(self, event):
+        # 关闭窗口时撤销尚未开始的图标任务，正在执行的任务结果会被丢弃；常驻窗口只是隐藏，任务照常完成
+        if not self.persistent:
+            try:
+                self._icon_pool.cancel_owner(self)
+                self.loading_set.clear()
+            except Exception:
+                pass
+        super().closeEvent(event)
+
+    def prepare_hidden(self):
+        """在窗口显示之前完成布局与网格构建，使之后的 present() 只需显示窗口。"""
+        # 不上屏地显示一次：创建原生窗口并让滚动区得到真实的视口宽度，再按该宽度建立网格
+        self.setAttribute(Qt.WidgetAttribute.WA_DontShowOnScreen, True)
+        self.show()
+        try:
+            self.rebuild_app_grid(self.search.text())
+        finally:
+            self.hide()
+            self.setAttribute(Qt.WidgetAttribute.WA_DontShowOnScreen, False)
+
+    def present(self):
+        """显示（或重新显示）窗口：清空搜索、居中并激活，网格沿用上次构建的单元。"""
+        if self.search.text():
+            # 清空后立即筛选（只让被过滤的单元重新出现），不把上次的搜索结果显示一帧
+            self.search.clear()
+            self._apply_search()
+        elif self._resort_pending:
+            self.rebuild_app_grid()
+        self._resort_pending = False
+        if self.windowState() & Qt.WindowState.WindowMinimized:
+            self.setWindowState(self.windowState() & ~Qt.WindowState.WindowMinimized)
+        if not self._maximized:
+            screen_geom = QApplication.primaryScreen().availableGeometry()
+            x = screen_geom.x() + (screen_geom.width() - self.width()) // 2
+            y = screen_geom.y() + (screen_geom.height() - self.height()) // 2
+            self.move(x, y)
+        self.show()
+        self.raise_()
+        self.activateWindow()
+        if self.focus_search_on_open:
+            self.search.setFocus(Qt.FocusReason.ActiveWindowFocusReason)
+
+    def sync_apps(self, apps):
+        """用重新读取的应用列表替换 self.apps。
+
+        内容未变的条目沿用原来的 dict，这样它们的单元与图标直接复用，只有新增/修改的条目需要创建单元。
+        """
+        pool = {}
+        for a in self.apps:
+            pool.setdefault(json.dumps(a, sort_keys=True, ensure_ascii=False), []).append(a)
+        merged = []
+        for a in apps:
+            same = pool.get(json.dumps(a, sort_keys=True, ensure_ascii=False))
+            merged.append(same.pop(0) if same else a)
+        self.apps = merged
+        self._search_index.stale = True
+        self.rebuild_app_grid(self.search.text() if hasattr(self, 'search') else '')
 
     def resizeEvent(self, event):
         # 窗口大小变化时重新布局网格，并保持 main_frame 大小同步
@@ -1532,14 +4350,86 @@ class LauncherWindow(QWidget):
         try:
             super().resizeEvent(event)
         finally:
-            # 延迟重建以确保布局组件尺寸已更新
+            # 只重新排列已有单元，连续的尺寸变化合并到下一帧处理
             try:
-                self.rebuild_app_grid(self.search.text() if hasattr(self, 'search') else '')
+                self._schedule_relayout()
             except Exception:
                 pass
 
     def on_search_text_changed(self, text):
+        # 输入按帧合并：一帧内的多次变化（快速输入、输入法提交）只筛选一次
+        if not self._search_timer.isActive():
+            self._search_timer.start()
+
+    def _apply_search(self):
+        """按搜索框当前内容筛选：只显示/隐藏并移动已有单元，不重建单元。"""
+        self._search_timer.stop()
+        text = self.search.text()
         self.rebuild_app_grid(text)
+        # 有搜索词时默认选中排名第一的结果，回车即可启动
+        self._set_selection(0 if text.strip() and self._order else -1)
+
+    def _on_search_key(self, event):
+        """搜索框的键盘快捷路径；返回 True 表示按键已处理。只移动选中标记，不重建网格。"""
+        key = event.key()
+        if key in (Qt.Key.Key_Return, Qt.Key.Key_Enter):
+            if self._search_timer.isActive():
+                # 输入后立即回车：先应用尚未执行的筛选
+                self._apply_search()
+            i = self._selected if self._selected >= 0 else (0 if self.search.text().strip() else -1)
+            if 0 <= i < len(self._order):
+                self._activate_app(self._order[i])
+            return True
+        if key == Qt.Key.Key_Escape:
+            if self.search.text():
+                self.search.clear()
+            else:
+                self.close()
+            return True
+        cols = self._grid_cols
+        if getattr(self, 'grid_engine', 'widgets') == 'view' and self._grid_view is not None:
+            # QListView 自行换行，列数按视口宽度与格子宽度推算
+            cols = max(1, self._grid_view.viewport().width() // max(1, self._grid_view.gridSize().width()))
+        steps = {Qt.Key.Key_Left: -1, Qt.Key.Key_Right: 1, Qt.Key.Key_Up: -cols, Qt.Key.Key_Down: cols}
+        if key not in steps or event.modifiers() & ~Qt.KeyboardModifier.KeypadModifier:
+            return False
+        if key in (Qt.Key.Key_Left, Qt.Key.Key_Right) and self._selected < 0 and self.search.text():
+            # 没有选中时左右键仍用于移动文字光标
+            return False
+        if not self._order:
+            return True
+        if self._search_timer.isActive():
+            self._apply_search()
+        if self._selected < 0:
+            self._set_selection(0)
+        else:
+            self._set_selection(min(max(self._selected + steps[key], 0), len(self._order) - 1))
+        return True
+
+    def _set_selection(self, index):
+        """选中 self._order[index]（-1 取消）：更新高亮层并滚动到可见处。"""
+        if not 0 <= index < len(self._order):
+            index = -1
+        self._selected = index
+        if getattr(self, 'grid_engine', 'widgets') == 'view':
+            if self._grid_view is not None:
+                self._grid_view.select_row(index)
+            return
+        self._show_selection()
+        if index >= 0 and index < len(self.grid_positions):
+            pos = self.grid_positions[index]
+            half = self.btn_size // 2
+            self._scroll.ensureVisible(pos.x() + half, pos.y() + self._grid_cell_h // 2,
+                                       half + self.grid_spacing, self._grid_cell_h // 2 + self.grid_spacing)
+
+    def _show_selection(self):
+        """按当前格子位置重画选中标记（网格重新排列后调用）。"""
+        i = self._selected
+        if 0 <= i < len(self.grid_positions):
+            rect = QRect(self.grid_positions[i], QSize(self.btn_size, self.btn_size))
+        else:
+            rect = QRect()
+        self._magnet_overlay.show_selection(rect)
 
     # --- 设置 ---
     def open_settings_dialog(self):
@@ -1582,6 +4472,18 @@ class LauncherWindow(QWidget):
         self.grid_margin = cfg.get('grid_margin', self.grid_margin)
         self._magnet_threshold = cfg.get('magnet_threshold', self._magnet_threshold)
         self._magnet_delay_ms = cfg.get('magnet_delay', self._magnet_delay_ms)
+        self.grid_virtualize = cfg.get('grid_virtualize', self.grid_virtualize)
+        self.grid_engine = cfg.get('grid_engine', self.grid_engine)
+        self.grid_relayout_animate = bool(cfg.get('grid_relayout_animate', self.grid_relayout_animate))
+        if cfg.get('grid_sort') in ('manual', 'frecency'):
+            self.grid_sort = cfg['grid_sort']
+        self.focus_search_on_open = bool(cfg.get('focus_search_on_open', self.focus_search_on_open))
+        # 网页图标缓存过期时间（小时），过期后用条件请求刷新
+        if 'favicon_ttl_hours' in cfg:
+            try:
+                get_icon_cache_index().ttl = max(0.0, float(cfg['favicon_ttl_hours'])) * 3600
+            except (TypeError, ValueError):
+                pass
 
     def load_settings(self):
         """从 settings.json 读取个性化配置。"""
@@ -1595,9 +4497,20 @@ class LauncherWindow(QWidget):
             pass
 
     def save_settings(self, cfg):
+        # 与已有内容合并，保留设置界面中没有的配置项（如 favicon_ttl_hours）
+        data = {}
+        try:
+            if os.path.exists(self.settings_path):
+                with open(self.settings_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+        except Exception:
+            data = {}
+        if not isinstance(data, dict):
+            data = {}
+        data.update(cfg)
         try:
             with open(self.settings_path, 'w', encoding='utf-8') as f:
-                json.dump(cfg, f, ensure_ascii=False, indent=4)
+                json.dump(data, f, ensure_ascii=False, indent=4)
         except Exception:
             raise
 
@@ -1752,6 +4665,7 @@ class LauncherWindow(QWidget):
 
     def _on_launch_combo(self, app):
         """同时启动组合中的所有成员（按顺序）。"""
+        self._record_launch(launch_key(app))
         try:
             members = self._flatten_combo_apps(app)
             for m in members:
@@ -1773,6 +4687,35 @@ class LauncherWindow(QWidget):
         except Exception:
             pass
 
+    def _merge_into_combo(self, app_a, app_b, target_idx):
+        """把 A、B 生成组合应用并按显示序号 target_idx 插入（保留 A/B 原有条目），随后保存。"""
+        members = self._flatten_combo_apps(app_a) + self._flatten_combo_apps(app_b)
+        # 组合名称：前两个名称 + “等N项”
+        names = []
+        for m in members[:2]:
+            if isinstance(m, dict):
+                names.append(m.get('name',''))
+            else:
+                names.append(str(m))
+        if len(members) > 2:
+            combo_name = f"{' & '.join(names)} 等{len(members)}项"
+        else:
+            combo_name = ' & '.join(names) if names else '组合'
+
+        combo_app = {
+            'name': combo_name or '组合',
+            'combo': members,
+            'icon': 'combo'
+        }
+
+        # 重建 apps：保留 A/B 原有按钮，再额外插入组合
+        new_order = list(self._order)
+        target_idx = max(0, min(target_idx, len(new_order)))
+        new_order.insert(target_idx, combo_app)
+        self._commit_display_order(new_order)
+        self.save_config()
+        return combo_app
+
     def _flatten_combo_apps(self, app):
         """将组合展开成成员列表，普通应用返回自身列表。"""
         if isinstance(app, dict) and app.get('combo'):
@@ -1793,9 +4736,8 @@ class LauncherWindow(QWidget):
                     break
             if idx is None:
                 return
-            if idx < len(self.cells):
-                cell = self.cells[idx]
-            else:
+            cell = self._cell_by_app.get(id(app))
+            if cell is not None and (cell.app is not app or cell.isHidden()):
                 cell = None
 
             # 如果有对应的 cell，做并行动画：放大 + 透明度变为 0
@@ -1841,7 +4783,7 @@ class LauncherWindow(QWidget):
 
                     group.finished.connect(on_finished)
                     group.start()
-                    self._anims.append(group)
+                    self._keep_animation(group)
                     return
                 except Exception:
                     pass
@@ -1869,6 +4811,7 @@ class LauncherWindow(QWidget):
             QMessageBox.information(self, '提示', '名称不能为空。')
             return
         app['name'] = new_name
+        self._search_index.touch(app)
         try:
             self.save_config()
         except Exception as e:
@@ -1891,6 +4834,8 @@ class LauncherWindow(QWidget):
         self.rebuild_app_grid(self.search.text() if hasattr(self, 'search') else '')
 
     def eventFilter(self, source, event):
+        if source is getattr(self, 'search', None):
+            return event.type() == QEvent.Type.KeyPress and self._on_search_key(event)
         # 仅响应顶栏区域的拖动事件来自定义拖动窗口
         if event.type() == QEvent.Type.MouseButtonPress and event.button() == Qt.MouseButton.LeftButton:
             if source and isinstance(source, QWidget):
@@ -1976,12 +4921,18 @@ class LauncherWindow(QWidget):
 
     def save_config(self):
         """将当前 self.apps 写回 apps.json（覆盖）。"""
+        # 增删改与重排都会经过这里保存
+        self._search_index.stale = True
         config_path = os.path.join(os.path.dirname(__file__), 'apps.json')
         try:
             with open(config_path, 'w', encoding='utf-8') as f:
                 json.dump(self.apps, f, ensure_ascii=False, indent=4)
         except Exception:
             raise
+        try:
+            self.apps_mtime = os.path.getmtime(config_path)
+        except OSError:
+            pass
 
     def reorder_apps(self, source_path, target_path=None):
         """把 source_path 对应的 app 移动到 target_path 所在位置之前；如果 target_path 为 None 则移到末尾。"""
@@ -2022,8 +4973,20 @@ class LauncherWindow(QWidget):
             pass
 
     # --- Drag / Reorder helpers for realtime drag-and-animate behavior ---
+    def drag_enabled(self):
+        """是否允许拖拽重排与磁吸组合。
+
+        frecency 排序下显示顺序由启动记录决定：拖拽结果会被下一次排序覆盖，
+        把排序后的顺序写回又会抹掉手动顺序，因此两者都不可用。
+        """
+        return self.grid_sort != 'frecency'
+
     def start_drag(self, cell, press_global_pos):
         """开始拖拽：记录初始状态，将当前单元置顶。"""
+        self._drag_frames.reset()
+        if not self.drag_enabled():
+            # 不进入拖拽状态：之后的移动与释放都会被忽略，释放也不会触发点击
+            return
         try:
             self._dragging_cell = cell
             cell.raise_() # 让被拖拽的物体浮在最上层
@@ -2039,11 +5002,8 @@ class LauncherWindow(QWidget):
             content_pos = self._content_widget.mapFromGlobal(press_global_pos)
             self._dragging_offset = content_pos - cell.pos()
             
-            # 记录当前被拖拽物体在列表中的索引，用于检测位置变化
-            if cell in self.cells:
-                self._drag_current_idx = self.cells.index(cell)
-            else:
-                self._drag_current_idx = -1
+            # 记录当前被拖拽物体在显示顺序中的索引，用于检测位置变化
+            self._drag_current_idx = self._display_index(cell.app)
                 
         except Exception as e:
             print(f"Start drag error: {e}")
@@ -2070,25 +5030,18 @@ class LauncherWindow(QWidget):
             if self._magnet_target:
                 follow_pos = QPoint(cw, ch) + self._magnet_offset
                 self._magnet_target.move(follow_pos)
+                self._magnet_overlay.track()
                 return
             
             # 磁吸预检测：靠近后开启计时，达到延时才真正吸附
+            # 只检查空间索引中拖拽物附近槽位的单元
             g1 = cell.geometry()
             nearest = None
             nearest_snap = None
-            for other in self.cells:
+            for other in self._magnet_neighbours(g1):
                 if other is cell:
                     continue
-                g2 = other.geometry()
-                overlap_y = not (g1.bottom() < g2.top() or g2.bottom() < g1.top())
-                dx = min(abs(g1.right() - g2.left()), abs(g2.right() - g1.left()))
-
-                snap_pos = None
-                # 仅在左右边缘接近且垂直方向有重叠时才允许磁吸，避免上下误吸附
-                if overlap_y and dx <= self._magnet_threshold:
-                    snap_x = g2.left() - g1.width() if g1.center().x() < g2.center().x() else g2.right()
-                    snap_pos = QPoint(snap_x, g1.y())
-
+                snap_pos = self._magnet_snap(g1, other.geometry())
                 if snap_pos is not None:
                     nearest = other
                     nearest_snap = snap_pos
@@ -2099,7 +5052,7 @@ class LauncherWindow(QWidget):
                 self._magnet_candidate = None
                 self._magnet_candidate_snap = None
                 self._magnet_timer.stop()
-                self._clear_magnet_style_on_all()
+                self._magnet_overlay.clear()
             else:
                 # 在范围内但需要停留一段时间才吸附
                 if self._magnet_candidate is not nearest or self._magnet_candidate_snap != nearest_snap:
@@ -2107,10 +5060,10 @@ class LauncherWindow(QWidget):
                     self._magnet_candidate_snap = nearest_snap
                     self._magnet_timer.start(self._magnet_delay_ms)
                     # 预览样式：当前拖拽物与目标高亮
-                    self._clear_magnet_style_on_all()
-                    self._apply_magnet_style(cell, True, strong=False)
-                    self._apply_magnet_style(nearest, True, strong=False)
+                    self._magnet_overlay.show_for((cell, nearest), strong=False)
                 else:
+                    # 高亮跟随拖拽物
+                    self._magnet_overlay.track()
                     # 若正在等待，保持计时
                     if not self._magnet_timer.isActive():
                         self._magnet_timer.start(self._magnet_delay_ms)
@@ -2141,57 +5094,73 @@ class LauncherWindow(QWidget):
             target_idx = row * cols_count + col
             
             # 索引边界限制
-            target_idx = max(0, min(target_idx, len(self.cells) - 1))
+            target_idx = max(0, min(target_idx, len(self._order) - 1))
 
             # 3. 碰撞检测与重排 (Collision & Reorder)
             # 如果计算出的目标位置不是当前位置，说明发生了“碰撞/挤压”
-            if target_idx != self._drag_current_idx:
+            if target_idx != self._drag_current_idx and self._drag_current_idx != -1:
                 
-                # 在内存列表中移动元素：把拖拽物从旧位置拔出来，插到新位置
+                # 在显示顺序中移动元素：把拖拽物从旧位置拔出来，插到新位置
                 # 这就像挤公交车，一个人挤进去，后面所有人往后挪
-                cell_obj = self.cells.pop(self._drag_current_idx)
-                self.cells.insert(target_idx, cell_obj)
+                app_obj = self._order.pop(self._drag_current_idx)
+                self._order.insert(target_idx, app_obj)
                 
                 # 更新当前索引
                 self._drag_current_idx = target_idx
+                order_index = {id(a): i for i, a in enumerate(self._order)}
+                self.cells.sort(key=lambda c: order_index.get(id(c.app), 0))
+                self._tile_index = None
                 
-                # 4. 触发物理动画：让除了被拖拽物之外的所有图标归位
-                for i, c in enumerate(self.cells):
+                # 4. 触发物理动画：让除了被拖拽物之外的所有已创建单元归位
+                moves = []
+                for c in self.cells:
                     if c is self._dragging_cell:
                         continue # 被拖拽物由鼠标控制，不参与自动归位
                     
                     # 获取该索引原本应该在的物理坐标
-                    if i < len(self.grid_positions):
-                        target_pos = self.grid_positions[i]
-                    else:
-                        continue
-
-                    # 只有位置不对时才通过动画移动
-                    if c.pos() != target_pos:
-                        # 创建动画（弹性效果）
-                        anim = QPropertyAnimation(c, b'pos', self)
-                        anim.setDuration(FastRunTiming.NORMAL)
-                        
-                        # 使用弹性曲线实现苹果风格的动画效果
-                        elastic_curve = QEasingCurve(QEasingCurve.Type.OutElastic)
-                        elastic_curve.setAmplitude(0.8)
-                        elastic_curve.setPeriod(0.5)
-                        anim.setEasingCurve(elastic_curve) 
-                        
-                        anim.setStartValue(c.pos())
-                        anim.setEndValue(target_pos)
-                        anim.start()
-                        
-                        # 存入动画池防止被垃圾回收
-                        self._anims.append(anim)
-                
-                # 清理已完成的动画
-                self._anims = [a for a in self._anims if a.state() == QPropertyAnimation.Running]
+                    i = order_index.get(id(c.app), -1)
+                    if 0 <= i < len(self.grid_positions):
+                        moves.append((c, self.grid_positions[i]))
+
+                # 使用弹性曲线实现苹果风格的动画效果；仍在途中的单元直接改为新终点，不叠加动画
+                elastic_curve = QEasingCurve(QEasingCurve.Type.OutElastic)
+                elastic_curve.setAmplitude(0.8)
+                elastic_curve.setPeriod(0.5)
+                self._cell_anims.wave(moves, FastRunTiming.NORMAL, elastic_curve)
 
         except Exception as e:
             # print(e) 
             pass
 
+    def _magnet_snap(self, g1, g2):
+        """拖拽物 g1 与格子 g2 可以磁吸时返回 g1 的吸附位置，否则返回 None。"""
+        overlap_y = not (g1.bottom() < g2.top() or g2.bottom() < g1.top())
+        dx = min(abs(g1.right() - g2.left()), abs(g2.right() - g1.left()))
+        # 仅在左右边缘接近且垂直方向有重叠时才允许磁吸，避免上下误吸附
+        if not (overlap_y and dx <= self._magnet_threshold):
+            return None
+        snap_x = g2.left() - g1.width() if g1.center().x() < g2.center().x() else g2.right()
+        return QPoint(snap_x, g1.y())
+
+    def _magnet_neighbours(self, rect):
+        """返回可能与 rect 发生磁吸的单元（按显示顺序）。
+
+        索引按单元的当前矩形建立；有单元正在动画移动时矩形每帧都在变化（重排 wave 中换行的单元
+        可能远离目标槽位），此时直接遍历全部单元，动画结束后再重建索引。
+        """
+        if self._cell_anims.running() or self._anims:
+            self._tile_index = None
+            return self.cells
+        if self._tile_index is None:
+            margin = getattr(self, 'grid_margin', 12)
+            spacing = getattr(self, 'grid_spacing', 16)
+            index = TileGridIndex(margin, margin, getattr(self, 'btn_size', 72) + spacing,
+                                  self._grid_cell_h + spacing)
+            order_index = {id(a): i for i, a in enumerate(self._order)}
+            index.rebuild((order_index[id(c.app)], c.geometry(), c) for c in self.cells if id(c.app) in order_index)
+            self._tile_index = index
+        return self._tile_index.near(rect, reach=self._magnet_threshold)
+
     def _confirm_magnet_candidate(self):
         """计时结束后确认磁吸，避免误触发。"""
         try:
@@ -2202,11 +5171,7 @@ class LauncherWindow(QWidget):
                 return
 
             # 再次验证仍在阈值内
-            g1 = cell.geometry()
-            g2 = other.geometry()
-            overlap_y = not (g1.bottom() < g2.top() or g2.bottom() < g1.top())
-            dx = min(abs(g1.right() - g2.left()), abs(g2.right() - g1.left()))
-            if not (overlap_y and dx <= self._magnet_threshold):
+            if self._magnet_snap(cell.geometry(), other.geometry()) is None:
                 return
 
             # 执行吸附
@@ -2216,43 +5181,28 @@ class LauncherWindow(QWidget):
             self._magnet_offset = other.pos() - cell.pos()
             other.move(cell.pos() + self._magnet_offset)
             # 确认后加重高亮，提示已吸附（无需脉冲避免抖动）
-            self._apply_magnet_style(cell, True, strong=True)
-            self._apply_magnet_style(other, True, strong=True)
+            self._magnet_overlay.show_for((cell, other), strong=True)
         finally:
             self._magnet_candidate = None
             self._magnet_candidate_snap = None
             self._magnet_timer.stop()
 
+    def queue_drag_move(self, cell, global_pos):
+        """记录拖拽中的最新指针位置，update_drag 每个显示帧最多执行一次。"""
+        self._drag_frames.push(cell, global_pos)
+
     def end_drag(self, cell, global_pos):
         """结束拖拽：吸附归位并保存数据。"""
+        # 先处理最后一次尚未处理的移动，使落点与释放位置一致
+        self._drag_frames.flush()
+        self.last_drag_stats = self._drag_frames.stats()
+        dbg(f"拖拽事件: {self.last_drag_stats}")
         try:
             if self._dragging_cell is not cell:
                 return
             
             # 如果有磁吸目标，则把两者作为一组一起归位并更新顺序
             if self._magnet_target:
-                # 生成组合应用 C
-                app_a = cell.app
-                app_b = self._magnet_target.app
-                members = self._flatten_combo_apps(app_a) + self._flatten_combo_apps(app_b)
-                # 组合名称：前两个名称 + “等N项”
-                names = []
-                for m in members[:2]:
-                    if isinstance(m, dict):
-                        names.append(m.get('name',''))
-                    else:
-                        names.append(str(m))
-                if len(members) > 2:
-                    combo_name = f"{' & '.join(names)} 等{len(members)}项"
-                else:
-                    combo_name = ' & '.join(names) if names else '组合'
-
-                combo_app = {
-                    'name': combo_name or '组合',
-                    'combo': members,
-                    'icon': 'combo'
-                }
-
                 # 按落点索引插入新组合
                 margin = getattr(self, 'grid_margin', 12)
                 spacing = getattr(self, 'grid_spacing', 16)
@@ -2266,14 +5216,8 @@ class LauncherWindow(QWidget):
                 avail_w = max(200, self._content_widget.width())
                 cols_count = max(1, avail_w // grid_w)
                 target_idx = row * cols_count + col
-                target_idx = max(0, min(target_idx, len(self.cells) - 1))
-
-                # 重建 apps：保留 A/B 原有按钮，再额外插入组合
-                new_apps = [c.app for c in self.cells]
-                target_idx = min(target_idx, len(new_apps))
-                new_apps.insert(target_idx, combo_app)
-                self.apps = new_apps
-                self.save_config()
+                target_idx = max(0, min(target_idx, len(self._order) - 1))
+                self._merge_into_combo(cell.app, self._magnet_target.app, target_idx)
 
                 # 重置磁吸状态并重建网格以生成组合按钮
                 self._magnet_target = None
@@ -2286,41 +5230,72 @@ class LauncherWindow(QWidget):
                 return
             
             # 1. 最终吸附动画 (Snap to Grid)
-            # 找到当前它在列表中的位置对应的物理坐标
-            final_idx = -1
-            if cell in self.cells:
-                final_idx = self.cells.index(cell)
+            # 找到当前它在显示顺序中的位置对应的物理坐标
+            final_idx = self._display_index(cell.app)
+            if self._virtual:
+                # 重排后视口边缘可能有应用移入/移出，补齐单元（被拖拽的单元不受影响）
+                self._sync_cells()
             
             if final_idx != -1 and final_idx < len(self.grid_positions):
                 dest = self.grid_positions[final_idx]
                 
-                anim = QPropertyAnimation(cell, b'pos', self)
-                anim.setDuration(FastRunTiming.ELASTIC)
                 # 使用弹性曲线实现苹果风格的吸附效果
                 elastic_curve = QEasingCurve(QEasingCurve.Type.OutElastic)
                 elastic_curve.setAmplitude(1.0)
                 elastic_curve.setPeriod(0.6)
-                anim.setEasingCurve(elastic_curve)
-                anim.setStartValue(cell.pos())
-                anim.setEndValue(dest)
-                anim.start()
-                self._anims.append(anim)
+                self._cell_anims.move(cell, dest, FastRunTiming.ELASTIC, elastic_curve)
             
             # 2. 同步数据结构 (self.apps) 并保存到文件
-            # 因为 self.cells 的顺序已经变了，我们需要根据 cell.app 更新 self.apps
-            new_apps_list = [c.app for c in self.cells]
-            self.apps = new_apps_list
+            # 因为显示顺序已经变了，按 _order 更新 self.apps（搜索过滤时不影响未显示的应用）
+            self._commit_display_order(self._order)
             self.save_config()
             
         except Exception as e:
             print(f"End drag error: {e}")
         finally:
+            self._magnet_overlay.clear()
             self._dragging_cell = None
             self._drag_current_idx = -1
             self._magnet_candidate = None
             self._magnet_candidate_snap = None
             self._magnet_timer.stop()
 
+    def _request_combo_icon(self, combo_key, members, size, priority=0):
+        """返回可立即显示的组合图标（缓存命中或成员变化前的旧图），必要时提交后台绘制。"""
+        dpr = self.devicePixelRatioF()
+        cache = get_combo_icon_cache()
+        icon, sig, stale = cache.lookup(combo_key, members, size, dpr)
+        if icon is not None:
+            return icon
+        # exe / 快捷方式等成员的系统图标只能在 GUI 线程提取，先转换为 QImage 交给工作线程
+        items = []
+        for key in members[:9]:
+            if _needs_system_icon(key):
+                member_icon = self.icon_cache.get(key)
+                if member_icon is None or member_icon.isNull():
+                    member_icon = extract_qicon_from_file(key)
+                img = member_icon.pixmap(QSize(size, size), dpr).toImage() if not member_icon.isNull() else QImage()
+                items.append(img if not img.isNull() else key)
+            else:
+                items.append(key)
+        cache.begin(combo_key, size, dpr, sig)
+        job_key = self._icon_pool.submit_combo(combo_key, items, size, dpr, sig, self._on_combo_rendered,
+                                               owner=self, priority=priority)
+        self._combo_jobs[job_key] = (combo_key, size, dpr)
+        return stale
+
+    def _on_combo_rendered(self, job_key, icon):
+        # 工作线程绘制完成（已在 GUI 线程转换为 QIcon），再走与普通图标相同的按钮更新流程
+        request = self._combo_jobs.pop(job_key, None)
+        if request is None or icon.isNull():
+            return
+        combo_key, size, dpr = request
+        if not get_combo_icon_cache().finish(combo_key, size, dpr, icon):
+            return
+        # 绘制期间按钮尺寸或屏幕缩放已变化：结果只留在缓存里，等新尺寸的任务更新按钮
+        if size == getattr(self, 'btn_size', 72) and dpr == self.devicePixelRatioF():
+            self._on_icon_loaded(combo_key, icon)
+
     def _on_icon_loaded(self, path, icon):
         # 缓存并更新已注册的按钮
         try:
@@ -2335,6 +5310,8 @@ class LauncherWindow(QWidget):
                     # 如果仍为空，显示首字母占位
                     if btn.toolTip():
                         btn.setText(btn.toolTip()[0])
+            if self._grid_view is not None:
+                self._grid_view.model_.icon_changed(path)
             # 清理加载集合
             if path in self.loading_set:
                 self.loading_set.remove(path)
@@ -2342,62 +5319,380 @@ class LauncherWindow(QWidget):
             pass
 
 
-class IconLoader(QThread):
-    icon_loaded = pyqtSignal(str, QIcon)
+class IconLoaderSignals(QObject):
+    # QRunnable 不是 QObject，信号挂在这个辅助对象上；工作线程只传递 QImage
+    image_loaded = pyqtSignal(str, QImage)
+    finished = pyqtSignal(object)
+
+
+def _read_icon_image(reader, target_px=None):
+    """用 QImageReader 读取图标：多帧 ICO 先选出最合适的一帧，再直接按目标尺寸输出。
+
+    选帧规则与网页图标候选一致：不小于 target_px 的最小帧，都偏小时取最大帧。
+    """
+    try:
+        if target_px and reader.imageCount() > 1 and bytes(reader.format()).lower() in (b'ico', b'cur'):
+            frames = []
+            for i in range(reader.imageCount()):
+                if reader.jumpToImage(i):
+                    s = reader.size()
+                    frames.append((max(s.width(), s.height()), i))
+            larger = [f for f in frames if f[0] >= target_px]
+            if larger:
+                reader.jumpToImage(min(larger)[1])
+            elif frames:
+                reader.jumpToImage(max(frames, key=lambda f: (f[0], -f[1]))[1])
+        size = reader.size()
+        if target_px and size.isValid() and max(size.width(), size.height()) > target_px:
+            reader.setScaledSize(size.scaled(target_px, target_px, Qt.AspectRatioMode.KeepAspectRatio))
+        return reader.read()
+    except Exception:
+        return QImage()
+
+
+def _decode_icon_image(fpath, data=None, target_px=None):
+    """在工作线程中把图标文件（或回退到原始字节）解码为 QImage，尺寸不超过 target_px。"""
+    img = QImage()
+    if fpath:
+        img = _read_icon_image(QImageReader(fpath), target_px)
+    if img.isNull() and data:
+        # try load from bytes directly
+        buf = QBuffer()
+        buf.setData(QByteArray(data))
+        buf.open(QIODevice.OpenModeFlag.ReadOnly)
+        img = _read_icon_image(QImageReader(buf), target_px)
+    return img
+
+
+def load_favicons(urls, emit, is_cancelled=lambda: False, target_px=64):
+    """联网解析 urls 的 favicon，按站点（及页面覆盖）写入缓存，并 emit(url, QImage)。
+
+    target_px 为图标的显示边长（物理像素），站点声明了多个图标时下载尺寸最合适的一个。
+
+    - 已缓存但过期的图标先立即 emit 旧图，再发条件请求，只有内容变化时才再次 emit；
+    - 同一站点的多个 URL（例如只是 query 不同）只抓取、只保存一次；
+    - 抓取失败的站点/页面记入退避，退避期内的 URL 直接 emit 缓存图或空图标。
+    """
+    index = get_icon_cache_index()
+    emitted = set()
+    fetch_urls = []
+    fresh_origins = set()
+    validators = {}
+    for u in dict.fromkeys(urls):
+        state, path = favicon_state(u)
+        if path:
+            emit(u, _decode_icon_image(path, None, target_px))
+            emitted.add(u)
+        if state in ('missing', 'stale'):
+            fetch_urls.append(u)
+            origin = favicon_origin(u)
+            if origin and index.has(origin) and not index.is_stale(origin):
+                fresh_origins.add(origin)
+            # 站点条目总是带上校验信息：过期时用于条件请求，未过期时用于识别与之相同的页面图标
+            if origin and index.has(origin):
+                validators[origin] = index.validators(origin)
+            page_key = favicon_page_key(u)
+            if page_key and index.has(page_key) and index.is_stale(page_key):
+                validators[page_key] = index.validators(page_key)
+        elif u not in emitted:
+            emit(u, QImage())
+    if not fetch_urls:
+        return
+
+    # 同一批次内，每个站点/页面键的结果只落盘一次
+    handled = set()
+
+    def apply(key, status, data, meta, alias_of=None):
+        if not key or key in handled:
+            return status == 'fetched'
+        handled.add(key)
+        if status == 'fetched':
+            save_icon_bytes_to_cache(key, data, meta)
+            return True
+        if status == 'not_modified':
+            index.touch(key)
+        elif status == 'alias':
+            # 页面没有独立图标：记录为站点图标的别名，之后不再扫描该页面
+            index.put_alias(key, alias_of)
+        elif status == 'failed':
+            index.record_failure(key)
+        return False
+
+    def on_result(url, result):
+        if is_cancelled():
+            return
+        try:
+            changed = apply(result.origin, result.origin_status, result.origin_data, result.origin_meta)
+            changed = apply(result.page_key, result.page_status, result.page_data, result.page_meta,
+                            alias_of=result.origin) or changed
+            if changed or url not in emitted:
+                emit(url, _decode_icon_image(lookup_favicon(url), result.data, target_px))
+                emitted.add(url)
+        except Exception:
+            if url not in emitted:
+                emit(url, QImage())
+
+    try:
+        fetch_favicons(fetch_urls, on_result=on_result, skip_origins=fresh_origins, validators=validators,
+                       target_px=target_px)
+    finally:
+        # 整批结果只写一次 manifest
+        index.flush()
+
+
+class IconLoader(QRunnable):
+    """在共享线程池中读取并解码单个图标（QImage），结果通过 image_loaded 信号回到 GUI 线程。
 
-    def __init__(self, path):
+    工作线程里不创建 QPixmap / QIcon；转换由 IconLoadPool 在 GUI 线程批量完成。
+    """
+
+    def __init__(self, path, target_px=64):
         super().__init__()
         self.path = path
+        self.paths = [path]
+        self.target_px = target_px
+        self.cancelled = False
+        # owner -> slot，由 IconLoadPool 维护
+        self.owners = {}
+        self.signals = IconLoaderSignals()
+        self.image_loaded = self.signals.image_loaded
 
     def run(self):
+        if self.cancelled:
+            self.signals.finished.emit(self)
+            return
         try:
             if isinstance(self.path, str) and self.path.lower().startswith(('http://', 'https://')):
-                # URL -> 尝试从磁盘缓存加载
-                cache_dir = os.path.join(os.path.dirname(__file__), 'icon_cache')
-                h = hashlib.sha1(self.path.encode('utf-8')).hexdigest()
-                # 查找已有文件
-                found = None
-                if os.path.isdir(cache_dir):
-                    for fn in os.listdir(cache_dir):
-                        if fn.startswith(h):
-                            found = os.path.join(cache_dir, fn)
-                            break
-                if found and os.path.exists(found):
-                    pix = QPixmap(found)
-                    if not pix.isNull():
-                        icon = QIcon(pix)
-                    else:
-                        icon = QIcon()
+                # URL -> 尝试从磁盘缓存加载（按站点共享）
+                state, found = favicon_state(self.path)
+                if state in ('fresh', 'backoff'):
+                    img = _decode_icon_image(found, None, self.target_px)
                 else:
-                    data = fetch_favicon_bytes(self.path)
-                    if data:
-                        fpath = save_icon_bytes_to_cache(self.path, data)
-                        if fpath:
-                            pix = QPixmap()
-                            pix.load(fpath)
-                            if not pix.isNull():
-                                icon = QIcon(pix)
-                            else:
-                                icon = QIcon()
-                        else:
-                            # try load from bytes directly
-                            pix = QPixmap()
-                            if pix.loadFromData(data):
-                                icon = QIcon(pix)
-                            else:
-                                icon = QIcon()
-                    else:
-                        icon = QIcon()
+                    results = []
+                    load_favicons([self.path], lambda _url, im: results.append(im), lambda: self.cancelled,
+                                  self.target_px)
+                    img = results[-1] if results else QImage()
             else:
-                icon = extract_qicon_from_file(self.path)
+                # 本地图片文件；exe / 快捷方式等系统图标由 IconLoadPool 在 GUI 线程提取
+                img = _decode_icon_image(self.path, None, self.target_px)
         except Exception:
-            icon = QIcon()
+            img = QImage()
 
         # emit even if null to allow fallback handling
         try:
-            self.icon_loaded.emit(self.path, icon)
+            if not self.cancelled:
+                self.image_loaded.emit(self.path, img)
         except Exception:
             pass
+        finally:
+            self.signals.finished.emit(self)
+
+
+class FaviconBatchLoader(IconLoader):
+    """一次性抓取多个未缓存 URL 的 favicon：共享连接池与同主机请求合并，每完成一个立即回调。"""
+
+    def __init__(self, urls, target_px=64):
+        super().__init__(urls[0], target_px)
+        self.paths = list(urls)
+
+    def run(self):
+        if self.cancelled:
+            self.signals.finished.emit(self)
+            return
+
+        try:
+            load_favicons(self.paths, self.image_loaded.emit, lambda: self.cancelled, self.target_px)
+        except Exception as e:
+            print(f"批量获取网站图标失败: {e}")
+        finally:
+            self.signals.finished.emit(self)
+
+
+class ComboIconJob(IconLoader):
+    """在工作线程中读取或绘制组合图标（QImage）。
+
+    任务键为 combo_key@尺寸x像素比，同一组合不同尺寸的请求互不合并；结果以任务键回调。
+    """
+
+    def __init__(self, combo_key, items, size, dpr, sig):
+        super().__init__(f"{combo_key}@{size}x{dpr:g}")
+        self.combo_key = combo_key
+        self.items = items
+        self.size = size
+        self.dpr = dpr
+        self.sig = sig
+
+    def run(self):
+        try:
+            if self.cancelled:
+                return
+            img = get_combo_icon_cache().render_image(self.combo_key, self.items, self.size, self.dpr, self.sig)
+            if not self.cancelled:
+                self.image_loaded.emit(self.path, img)
+        except Exception as e:
+            print(f"绘制组合图标失败: {e}")
+        finally:
+            self.signals.finished.emit(self)
+
+
+class IconLoadPool(QObject):
+    """共享的、限定线程数的图标加载池。
+
+    - 同一路径只排队一次，多个窗口请求同一图标时共享结果；
+    - 按优先级出队（数值越大越先执行）；
+    - 窗口关闭时通过 cancel_owner 撤销其排队任务；
+    - 任务完成后立即释放引用；
+    - 工作线程只产出 QImage，回到 GUI 线程后攒成一批统一转换为 QPixmap / QIcon 再回调 slot(path, QIcon)；
+    - exe / 快捷方式 / 目录的系统图标只能在 GUI 线程提取，按时间片分批处理，不阻塞界面。
+    """
+
+    # 每个事件循环周期内提取系统图标的时间预算（秒）
+    GUI_SLICE = 0.008
+
+    def __init__(self, max_threads=4, parent=None):
+        super().__init__(parent)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max_threads)
+        # path -> IconLoader（批量任务的每个路径都指向同一个任务）
+        self._jobs = {}
+        # 已解码、等待批量转换的结果：[(owner -> slot, path, QImage)]
+        self._ready = []
+        # 等待在 GUI 线程提取系统图标的路径：path -> {owner: slot}
+        self._gui_queue = {}
+        self._gui_scheduled = False
+
+    def _attach(self, job, slot, owner):
+        if owner not in job.owners:
+            job.owners[owner] = slot
+
+    def _start(self, job, slot, owner, priority):
+        self._attach(job, slot, owner)
+        job.image_loaded.connect(self._on_image_loaded)
+        job.signals.finished.connect(self._on_job_finished)
+        for path in job.paths:
+            self._jobs[path] = job
+        self._pool.start(job, priority)
+
+    def submit(self, path, slot, owner, priority=0, target_px=64):
+        """提交加载任务；path 已在队列中时仅追加接收者。target_px 为图标显示边长（物理像素）。"""
+        if _needs_system_icon(path):
+            self._gui_queue.setdefault(path, {}).setdefault(owner, slot)
+            self._schedule_gui_queue()
+            return
+        job = self._jobs.get(path)
+        if job is not None and not job.cancelled:
+            self._attach(job, slot, owner)
+            return
+        self._start(IconLoader(path, target_px), slot, owner, priority)
+
+    def submit_batch(self, urls, slot, owner, priority=0, target_px=64):
+        """把多个需要联网的 URL 合并成一个批量任务提交。"""
+        pending = []
+        for url in dict.fromkeys(urls):
+            job = self._jobs.get(url)
+            if job is not None and not job.cancelled:
+                self._attach(job, slot, owner)
+            else:
+                pending.append(url)
+        if pending:
+            self._start(FaviconBatchLoader(pending, target_px), slot, owner, priority)
+
+    def submit_combo(self, combo_key, items, size, dpr, sig, slot, owner, priority=0):
+        """提交组合图标绘制任务，返回任务键；slot(任务键, QIcon) 在 GUI 线程接收结果。"""
+        job = ComboIconJob(combo_key, items, size, dpr, sig)
+        existing = self._jobs.get(job.path)
+        if existing is not None and not existing.cancelled and existing.sig == sig:
+            self._attach(existing, slot, owner)
+        else:
+            self._start(job, slot, owner, priority)
+        return job.path
+
+    def cancel_owner(self, owner):
+        """撤销 owner 提交的任务：没有其他接收者时，从队列中移除或标记为已取消。"""
+        for owners in self._gui_queue.values():
+            owners.pop(owner, None)
+        for owners, _path, _image in self._ready:
+            owners.pop(owner, None)
+        jobs = {id(j): j for j in self._jobs.values()}
+        for job in jobs.values():
+            if job.owners.pop(owner, None) is None or job.owners:
+                continue
+            job.cancelled = True
+            try:
+                taken = self._pool.tryTake(job)
+            except RuntimeError:
+                # 任务已执行完毕并被线程池删除
+                taken = False
+            if taken:
+                # 尚未开始：直接丢弃
+                self._release(job)
+
+    def _release(self, job):
+        for path in job.paths:
+            # 已取消的任务可能已被同路径的新任务替换，只释放自己
+            if self._jobs.get(path) is job:
+                del self._jobs[path]
+
+    def _on_job_finished(self, job):
+        self._release(job)
+
+    def _on_image_loaded(self, path, image):
+        # 排在 finished 之前到达，此时任务仍登记在 _jobs 中
+        job = self._jobs.get(path)
+        if job is None or not job.owners:
+            return
+        if not self._ready:
+            QTimer.singleShot(0, self._flush_ready)
+        self._ready.append((dict(job.owners), path, image))
+
+    def _flush_ready(self):
+        """GUI 线程：把本轮事件循环收到的所有 QImage 一次性转换为 QIcon 并分发。"""
+        ready, self._ready = self._ready, []
+        for owners, path, image in ready:
+            if not owners:
+                continue
+            icon = QIcon(QPixmap.fromImage(image)) if not image.isNull() else QIcon()
+            self._deliver(owners, path, icon)
+
+    @staticmethod
+    def _deliver(owners, path, icon):
+        for slot in list(owners.values()):
+            try:
+                slot(path, icon)
+            except Exception as e:
+                print(f"图标回调失败: {e}")
+
+    def _schedule_gui_queue(self):
+        if not self._gui_scheduled:
+            self._gui_scheduled = True
+            QTimer.singleShot(0, self._drain_gui_queue)
+
+    def _drain_gui_queue(self):
+        self._gui_scheduled = False
+        deadline = time.perf_counter() + self.GUI_SLICE
+        while self._gui_queue and time.perf_counter() < deadline:
+            path = next(iter(self._gui_queue))
+            owners = self._gui_queue.pop(path)
+            if not owners:
+                continue
+            try:
+                icon = extract_qicon_from_file(path)
+            except Exception:
+                icon = QIcon()
+            self._deliver(owners, path, icon)
+        if self._gui_queue:
+            self._schedule_gui_queue()
+
+
+_icon_load_pool = None
+
+
+def get_icon_load_pool():
+    """返回进程内共享的图标加载池（需在 QApplication 创建之后调用）。"""
+    global _icon_load_pool
+    if _icon_load_pool is None:
+        _icon_load_pool = IconLoadPool(max_threads=max(2, min(4, QThread.idealThreadCount())))
+    return _icon_load_pool
 
 
 class SettingsDialog(QDialog):